@@ -0,0 +1,112 @@
+import subprocess
+
+import numpy as np
+
+from cancellation import CancelToken
+
+SAMPLE_RATE = 16000  # Whisper's native sample rate
+CHUNK_BYTES = 1 << 20
+
+
+def _ffmpeg_pcm_command(ffmpeg_exe, path, sample_rate):
+    return [
+        ffmpeg_exe,
+        '-nostdin',
+        '-loglevel', 'error',
+        '-i', path,
+        '-vn',
+        '-f', 's16le',
+        '-ac', '1',
+        '-ar', str(sample_rate),
+        'pipe:1'
+    ]
+
+
+def load_audio(path, ffmpeg_exe='ffmpeg', sample_rate=SAMPLE_RATE, memmap_path=None, cancel_token=None):
+    """Decode the soundtrack of path to mono float32 PCM without a temp file.
+
+    ffmpeg's s16le output is piped straight into memory. When memmap_path is
+    given the samples are streamed to that file instead and returned as a
+    memory-mapped array, which keeps very long inputs out of RAM.
+    cancel_token kills the decode when the job is cancelled.
+    """
+    cancel_token = cancel_token or CancelToken()
+    cancel_token.check()
+    process = subprocess.Popen(
+        _ffmpeg_pcm_command(ffmpeg_exe, path, sample_rate),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    with cancel_token.track(process):
+        try:
+            if memmap_path:
+                samples = _stream_to_memmap(process.stdout, memmap_path)
+            else:
+                data = bytearray()
+                while True:
+                    chunk = process.stdout.read(CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    data.extend(chunk)
+                usable = len(data) - (len(data) % 2)
+                samples = np.frombuffer(data, dtype=np.int16, count=usable // 2).astype(np.float32) / 32768.0
+        finally:
+            process.stdout.close()
+            stderr = process.stderr.read()
+            process.stderr.close()
+            returncode = process.wait()
+    cancel_token.check()  # Killed by cancel(), not a decode error
+
+    if returncode != 0:
+        raise RuntimeError(f"FFmpeg audio decode failed: {stderr.decode(errors='ignore')[:200]}")
+    return samples
+
+
+def _stream_to_memmap(stream, memmap_path):
+    count = 0
+    leftover = b''
+    with open(memmap_path, 'wb') as f:
+        while True:
+            chunk = stream.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            chunk = leftover + chunk
+            usable = len(chunk) - (len(chunk) % 2)
+            leftover = chunk[usable:]
+            pcm = np.frombuffer(chunk, dtype=np.int16, count=usable // 2)
+            (pcm.astype(np.float32) / 32768.0).tofile(f)
+            count += pcm.shape[0]
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    # Copy-on-write so consumers may modify without touching the file
+    return np.memmap(memmap_path, dtype=np.float32, mode='c', shape=(count,))
+
+
+def find_split_points(samples, sample_rate=SAMPLE_RATE, target_seconds=60, search_seconds=10, frame_ms=30):
+    """Pick chunk boundaries at silences.
+
+    Every ~target_seconds the quietest frame (lowest mean energy) within
+    +/- search_seconds is chosen as the cut, so chunks rarely split a word.
+    Returns sample offsets starting with 0 and ending with len(samples).
+    """
+    total = len(samples)
+    target = max(1, int(target_seconds * sample_rate))
+    search = int(search_seconds * sample_rate)
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+
+    points = [0]
+    position = target
+    # Leave the remainder in the last chunk instead of producing a tiny one
+    while position + target // 4 < total:
+        low = max(points[-1] + frame, position - search)
+        high = min(total, position + search)
+        region = np.asarray(samples[low:high], dtype=np.float32)
+        frames = len(region) // frame
+        if frames:
+            energy = np.square(region[:frames * frame]).reshape(frames, frame).mean(axis=1)
+            cut = low + int(np.argmin(energy)) * frame + frame // 2
+        else:
+            cut = position
+        points.append(cut)
+        position = cut + target
+    points.append(total)
+    return points
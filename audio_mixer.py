@@ -0,0 +1,156 @@
+import os
+import subprocess
+
+import numpy as np
+from pydub import AudioSegment
+
+from cancellation import CancelToken
+
+
+class DubMixer:
+    """Dub track mixer backed by a single preallocated sample buffer.
+
+    Each clip is decoded once and summed in place at its offset, so mixing
+    cost grows with the total clip length instead of video length x clip count
+    (which is what repeated AudioSegment.overlay calls cost).
+    """
+
+    def __init__(self, duration_seconds, sample_rate=24000, channels=1, memmap_path=None):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.memmap_path = memmap_path
+        length = max(1, int(round(duration_seconds * sample_rate)))
+        if memmap_path:
+            # Very long videos: keep the buffer on disk instead of in RAM
+            self.samples = np.memmap(memmap_path, dtype=np.float32, mode='w+', shape=(length, channels))
+        else:
+            self.samples = np.zeros((length, channels), dtype=np.float32)
+
+    def __len__(self):
+        return self.samples.shape[0]
+
+    def segment_to_array(self, segment):
+        """Decode an AudioSegment to float32 samples in the mixer's format"""
+        segment = segment.set_frame_rate(self.sample_rate).set_channels(self.channels).set_sample_width(2)
+        data = np.frombuffer(segment.raw_data, dtype=np.int16).reshape(-1, self.channels)
+        return data.astype(np.float32) / 32768.0
+
+    def add(self, samples, position_seconds):
+        """Sum float32 samples into the buffer starting at position_seconds"""
+        if samples.ndim == 1:
+            samples = samples.reshape(-1, 1)
+        start = int(round(position_seconds * self.sample_rate))
+        if start >= len(self) or start < 0:
+            return
+        end = min(start + samples.shape[0], len(self))
+        self.samples[start:end] += samples[:end - start]
+
+    def add_segment(self, segment, position_seconds):
+        self.add(self.segment_to_array(segment), position_seconds)
+
+    def to_pcm16(self, start=0, end=None):
+        chunk = np.clip(self.samples[start:end], -1.0, 1.0)
+        return (chunk * 32767.0).astype(np.int16)
+
+    def to_audio_segment(self):
+        return AudioSegment(
+            data=self.to_pcm16().tobytes(),
+            sample_width=2,
+            frame_rate=self.sample_rate,
+            channels=self.channels,
+        )
+
+    def export(self, output_path, ffmpeg_exe='ffmpeg', chunk_seconds=30, cancel_token=None):
+        """Encode the mix with ffmpeg, streaming PCM in chunks to avoid a full copy"""
+        cancel_token = cancel_token or CancelToken()
+        cmd = [
+            ffmpeg_exe,
+            '-loglevel', 'error',
+            '-f', 's16le',
+            '-ar', str(self.sample_rate),
+            '-ac', str(self.channels),
+            '-i', 'pipe:0',
+            '-y',
+            output_path
+        ]
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        with cancel_token.track(process):
+            try:
+                step = chunk_seconds * self.sample_rate
+                for start in range(0, len(self), step):
+                    process.stdin.write(self.to_pcm16(start, start + step).tobytes())
+                process.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+            stderr = process.stderr.read()
+            returncode = process.wait()
+        cancel_token.check()  # Killed by cancel(), not an encode error
+        if returncode != 0:
+            raise RuntimeError(f"FFmpeg mix export failed: {stderr.decode(errors='ignore')[:200]}")
+        return output_path
+
+    def close(self):
+        """Release the buffer and remove the memory-mapped file if one was used"""
+        samples = self.samples
+        self.samples = np.zeros((1, self.channels), dtype=np.float32)
+        if isinstance(samples, np.memmap):
+            del samples  # Unmap before removing the backing file
+            if self.memmap_path and os.path.exists(self.memmap_path):
+                try:
+                    os.remove(self.memmap_path)
+                except OSError:
+                    pass
+
+
+def time_stretch(samples, rate, sample_rate=24000, frame_ms=40, tolerance_ms=10):
+    """Change the tempo of samples by rate (>1 is faster) without changing pitch.
+
+    WSOLA: Hann-windowed frames are overlap-added at a fixed output hop
+    while the input is read at hop * rate. Each frame is shifted by up to
+    tolerance_ms to where it best continues the previous frame, which avoids
+    the phasing artifacts of plain overlap-add. Any rate works in one pass,
+    unlike ffmpeg's atempo which has to be chained above 2.0.
+    samples: float32 array shaped (n,) or (n, channels).
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    if abs(rate - 1.0) < 1e-3 or len(samples) == 0:
+        return samples
+
+    x = np.asarray(samples, dtype=np.float32).reshape(len(samples), -1)
+    out_length = max(1, int(round(len(x) / rate)))
+    frame = max(32, int(sample_rate * frame_ms / 1000)) // 2 * 2
+    hop = frame // 2
+    tolerance = int(sample_rate * tolerance_ms / 1000)
+
+    if len(x) < frame:
+        # Too short for overlapping frames: plain resampling
+        positions = np.linspace(0, len(x) - 1, out_length)
+        stretched = np.stack([np.interp(positions, np.arange(len(x)), x[:, c]) for c in range(x.shape[1])], axis=1)
+        return stretched.astype(np.float32).reshape((out_length,) + samples.shape[1:])
+
+    # Pad so every candidate frame and continuation template stays in range
+    tail = frame + 2 * tolerance + hop + int(np.ceil(hop * rate)) + 1
+    padded = np.pad(x, ((tolerance, tail), (0, 0)))
+    guide = padded.mean(axis=1)  # Alignment is searched on the mono mix
+    window = np.hanning(frame + 1)[:frame].astype(np.float32)  # Periodic: sums to 1 at 50% overlap
+
+    frames = out_length // hop + 1
+    output = np.zeros((frames * hop + frame, x.shape[1]), dtype=np.float32)
+    weight = np.zeros(frames * hop + frame, dtype=np.float32)
+    previous = None
+    for k in range(frames):
+        nominal = int(round(k * hop * rate))  # Padded index of a -tolerance shift
+        if previous is None:
+            start = nominal + tolerance
+        else:
+            template = guide[previous + hop:previous + hop + frame]
+            region = guide[nominal:nominal + frame + 2 * tolerance]
+            start = nominal + int(np.argmax(np.correlate(region, template, mode='valid')))
+        position = k * hop
+        output[position:position + frame] += padded[start:start + frame] * window[:, None]
+        weight[position:position + frame] += window
+        previous = start
+
+    output /= np.maximum(weight, 1e-3)[:, None]
+    return output[:out_length].reshape((out_length,) + samples.shape[1:])
@@ -0,0 +1,714 @@
+"""Performance benchmarks.
+
+Examples:
+    python benchmark.py transcribe lecture.mp4 --workers 4 --chunk-seconds 300
+    python benchmark.py startup --budget-seconds 1.5
+    python benchmark.py pipeline --minutes 1,10,60 --languages tr,de --output after.json --baseline before.json
+    python benchmark.py subtitles --cues 100000
+
+Results are printed as JSON. startup exits with 1 when time-to-first-window
+is over budget; pipeline exits with 1 when a stage regressed against --baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import config_manager
+import subtitles
+from subtitles import Segment
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Builds and shows the main window the way main.py does, then prints the elapsed seconds
+FIRST_WINDOW_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+from main import preload_torch_dll
+if sys.platform == 'win32':
+    preload_torch_dll()
+from PyQt5.QtWidgets import QApplication
+from main_window import MainWindow
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+app.processEvents()
+print(time.perf_counter() - started)
+"""
+
+
+def bench_transcribe(args, config):
+    """Compare single-pass and chunked multi-process transcription on one file"""
+    import audio_io
+    import model_pool
+    import parallel_transcribe
+    from pipeline import DubbingPipeline
+
+    ffmpeg_exe = DubbingPipeline('', '', [], config).tool_path('ffmpeg')
+    started = time.perf_counter()
+    audio = audio_io.load_audio(args.input, ffmpeg_exe)
+    decode_seconds = time.perf_counter() - started
+    duration = len(audio) / audio_io.SAMPLE_RATE
+    settings = model_pool.model_settings(config)
+    options = model_pool.transcribe_options(config)
+    report = {
+        'input': args.input,
+        'audio_seconds': round(duration, 1),
+        'decode_seconds': round(decode_seconds, 2),
+        'model': settings[0],
+    }
+
+    if not args.skip_single:
+        model = model_pool.get_model(config)  # Load outside the timed region
+        started = time.perf_counter()
+        result = model.transcribe(audio, **options)
+        elapsed = time.perf_counter() - started
+        report['single'] = {
+            'seconds': round(elapsed, 2),
+            'realtime_factor': round(duration / elapsed, 2),
+            'segments': len(result['segments']),
+            'language': result.get('language'),
+        }
+        model_pool.pool.clear()  # Give the workers the memory back
+
+    started = time.perf_counter()
+    result = parallel_transcribe.transcribe_chunked(
+        audio, settings, options,
+        workers=args.workers,
+        chunk_seconds=args.chunk_seconds,
+        overlap_seconds=args.overlap_seconds,
+    )
+    elapsed = time.perf_counter() - started
+    report['chunked'] = {
+        'seconds': round(elapsed, 2),
+        'realtime_factor': round(duration / elapsed, 2),
+        'segments': len(result['segments']),
+        'language': result['language'],
+        'workers': args.workers,
+        'chunk_seconds': args.chunk_seconds,
+    }
+    if 'single' in report:
+        report['speedup'] = round(report['single']['seconds'] / elapsed, 2)
+    return report
+
+
+def measure_imports(module, cwd, env, top=15):
+    """Import module in a fresh interpreter with -X importtime.
+
+    Returns the total import time and the slowest modules by cumulative time (ms).
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=cwd, env=env)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': round(int(self_us) / 1000, 1),
+            'cumulative_ms': round(int(cumulative_us) / 1000, 1),
+        })
+    report = {
+        'ok': result.returncode == 0,
+        'total_ms': next((m['cumulative_ms'] for m in modules if m['module'] == module), None),
+        'slowest': sorted(modules, key=lambda m: -m['cumulative_ms'])[:top],
+    }
+    if result.returncode != 0:
+        report['error'] = result.stderr.strip().splitlines()[-1:]
+    return report
+
+
+def bench_startup(args, config):
+    """Per-module import time of the GUI path and the pipeline, plus time-to-first-window"""
+    # Run from an empty directory so no queued jobs are resumed and the user's config is untouched
+    cwd = tempfile.mkdtemp(prefix="startup_bench_")
+    shutil.copy(os.path.join(ROOT, 'languages.json'), cwd)
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    if args.offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    try:
+        report = {
+            'imports': {module: measure_imports(module, cwd, env) for module in ('main_window', 'pipeline')},
+            'budget_seconds': args.budget_seconds,
+        }
+        runs = []
+        for _ in range(args.repeat):
+            result = subprocess.run([sys.executable, '-c', FIRST_WINDOW_SCRIPT],
+                                    capture_output=True, text=True, cwd=cwd, env=env)
+            if result.returncode != 0:
+                report['first_window_error'] = result.stderr.strip().splitlines()[-1:]
+                break
+            runs.append(float(result.stdout.strip().splitlines()[-1]))
+        if runs:
+            report['first_window_seconds'] = round(min(runs), 3)
+            report['first_window_runs'] = [round(r, 3) for r in runs]
+            report['within_budget'] = min(runs) <= args.budget_seconds
+        else:
+            report['within_budget'] = False
+        return report
+    finally:
+        shutil.rmtree(cwd, ignore_errors=True)
+
+
+# Synthetic fixtures and offline stand-ins for the network services
+FIXTURE_SAMPLE_RATE = 48000
+CHARS_PER_SECOND = 15  # Speaking rate used to size stub TTS clips
+WORDS = ("the", "video", "today", "we", "will", "look", "at", "how", "this", "works", "and", "why", "it",
+         "matters", "for", "every", "project", "so", "let's", "start", "with", "the", "first", "step", "then",
+         "next", "one", "is", "a", "simple", "example", "of", "what", "you", "can", "do")
+FIXTURE_CODECS = {
+    'mp4': ['-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', '-c:a', 'aac', '-b:a', '96k'],  # convert_video skips
+    'mkv': ['-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', '-c:a', 'aac', '-b:a', '96k'],  # stream-copy remux
+    'webm': ['-c:v', 'libvpx-vp9', '-deadline', 'realtime', '-cpu-used', '8', '-c:a', 'libopus', '-b:a', '64k'],  # full transcode
+}
+
+
+def plan_segments(seconds, segments_per_minute, seed=0):
+    """Speech segments of a synthetic fixture as a list of Segment.
+
+    Segments fill 55-85% of their slot, the rest is a silence gap, so on
+    average there are segments_per_minute segments per minute of audio.
+    """
+    rng = random.Random(seed)
+    period = 60.0 / segments_per_minute
+    segments = []
+    position = period * rng.uniform(0.1, 0.3)
+    while True:
+        length = period * rng.uniform(0.55, 0.85)
+        if position + length > seconds - 0.2:
+            break
+        words = max(1, int(length * 2.5))
+        segments.append(Segment(round(position, 3), round(position + length, 3),
+                                " ".join(rng.choice(WORDS) for _ in range(words))))
+        position += length + period * rng.uniform(0.15, 0.45)
+    return segments
+
+
+def speech_like(seconds, sample_rate, rng):
+    """Voiced-speech stand-in: a gliding harmonic tone with syllable-rate amplitude bursts"""
+    import numpy as np
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+    f0 = rng.uniform(100, 220) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(0.3, 1.0) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = np.abs(np.sin(np.pi * rng.uniform(3, 5) * t)) ** 0.5
+    noise = np.random.default_rng(rng.randrange(2 ** 32)).normal(0, 0.01, n)
+    return (0.2 * voice * syllables + noise).astype(np.float32)
+
+
+def room_tone(seconds, sample_rate, rng):
+    import numpy as np
+    return np.random.default_rng(rng.randrange(2 ** 32)).normal(0, 0.003, int(seconds * sample_rate)).astype(np.float32)
+
+
+def make_fixture(directory, seconds, segments_per_minute, ffmpeg_exe, container='mp4', seed=0):
+    """Create (or reuse) a synthetic video with speech-like audio at the planned segments.
+
+    Audio is generated segment by segment and streamed into ffmpeg, so a
+    3 hour fixture never sits in memory. Returns (video_path, segments).
+    """
+    name = f"fixture_{int(seconds)}s_{segments_per_minute:g}spm_{seed}"
+    video_path = os.path.join(directory, f"{name}.{container}")
+    segments_path = os.path.join(directory, f"{name}.json")
+    if os.path.exists(video_path) and os.path.exists(segments_path):
+        with open(segments_path, 'r', encoding='utf-8') as f:
+            return video_path, subtitles.from_records(json.load(f))
+
+    os.makedirs(directory, exist_ok=True)
+    segments = plan_segments(seconds, segments_per_minute, seed)
+    rng = random.Random(seed)
+    temp_path = os.path.join(directory, f"{name}.partial.{container}")
+    cmd = [
+        ffmpeg_exe, '-v', 'error', '-y',
+        '-f', 'lavfi', '-i', f"color=c=0x203040:s=320x180:r=10:d={seconds}",
+        '-f', 'f32le', '-ar', str(FIXTURE_SAMPLE_RATE), '-ac', '1', '-i', 'pipe:0',
+    ] + FIXTURE_CODECS[container] + ['-shortest', temp_path]
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        position = 0.0
+        for segment in segments + [Segment(seconds, seconds, "")]:
+            while position < segment.start:  # Silence in blocks of at most a minute
+                gap = min(segment.start - position, 60.0)
+                process.stdin.write(room_tone(gap, FIXTURE_SAMPLE_RATE, rng).tobytes())
+                position += gap
+            if segment.end > segment.start:
+                process.stdin.write(speech_like(segment.end - segment.start, FIXTURE_SAMPLE_RATE, rng).tobytes())
+                position = segment.end
+        process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg could not write the fixture {video_path}")
+    except BaseException:
+        process.kill()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, video_path)
+    with open(segments_path, 'w', encoding='utf-8') as f:
+        json.dump(subtitles.to_records(segments), f)
+    return video_path, segments
+
+
+def simulated_delay(latency, jitter, rng):
+    return max(0.0, latency + rng.uniform(-jitter, jitter))
+
+
+class StubTranslator:
+    """Offline translator: tags every line with the target language after a simulated request delay"""
+
+    def __init__(self, target, latency=0.2, jitter=0.05, rng=None):
+        self.target = target
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def translate(self, text):
+        time.sleep(simulated_delay(self.latency, self.jitter, self.rng))
+        return "\n".join(f"[{self.target}] {line}" for line in text.split("\n"))
+
+
+class StubTTS:
+    """Offline TTS: copies a pre-rendered tone clip as long as the text takes to speak.
+
+    Clips are rendered once per 0.25 s length bucket; call prepare() with
+    the texts before timing so the rendering is not part of the measurement.
+    """
+
+    def __init__(self, directory, ffmpeg_exe, latency=0.3, jitter=0.1, seed=0):
+        self.directory = directory
+        self.ffmpeg_exe = ffmpeg_exe
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def clip_seconds(self, text):
+        return round(max(0.5, len(text) / CHARS_PER_SECOND) * 4) / 4
+
+    def clip(self, text):
+        seconds = self.clip_seconds(text)
+        path = os.path.join(self.directory, f"tone_{seconds:.2f}.mp3")
+        with self._lock:
+            if not os.path.exists(path):
+                subprocess.run([
+                    self.ffmpeg_exe, '-v', 'error', '-y',
+                    '-f', 'lavfi', '-i', f"sine=frequency=180:sample_rate=24000:duration={seconds}",
+                    '-c:a', 'libmp3lame', '-b:a', '48k', path
+                ], check=True)
+        return path
+
+    def prepare(self, texts):
+        for text in texts:
+            self.clip(text)
+
+    async def generate_edge_tts(self, text, output_file, voice):
+        self.requests += 1
+        await asyncio.sleep(simulated_delay(self.latency, self.jitter, self.rng))
+        shutil.copyfile(self.clip(text), output_file)
+
+    def generate_elevenlabs_tts(self, text, output_file, voice_id, config):
+        self.requests += 1
+        time.sleep(simulated_delay(self.latency, self.jitter, self.rng))
+        shutil.copyfile(self.clip(text), output_file)
+
+
+def install_engines(pipeline, args, segments, work_dir, ffmpeg_exe):
+    """Swap the selected stub engines into a pipeline; real engines are left as they are.
+
+    Returns the StubTTS (or None) so its clips can be prepared outside the timed stages.
+    """
+    if args.translator == 'stub':
+        rng = random.Random(args.seed)
+        pipeline.create_translator = lambda code: StubTranslator(
+            code, args.translate_latency_ms / 1000, args.jitter_ms / 1000, rng)
+    if args.transcriber == 'stub':
+        # The fixture's planned segments are the transcript
+        pipeline.transcribe = lambda video_path: {'language': 'en', 'segments': [s.replace() for s in segments]}
+    if args.tts != 'stub':
+        return None
+    tts = StubTTS(os.path.join(work_dir, 'stub_tts'), ffmpeg_exe,
+                  args.tts_latency_ms / 1000, args.jitter_ms / 1000, args.seed)
+    pipeline.generate_edge_tts = tts.generate_edge_tts
+    pipeline.generate_elevenlabs_tts = tts.generate_elevenlabs_tts
+    return tts
+
+
+def current_rss():
+    """Resident set size of this process in bytes (psutil, or /proc on Linux), None if unknown"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_child_rss():
+    """Largest RSS of any finished child process (ffmpeg) in bytes, None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class RssSampler:
+    """Samples this process's RSS in a background thread to find per-stage peaks"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self.overall = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        rss = current_rss() or 0
+        self.peak = max(self.peak, rss)
+        self.overall = max(self.overall, rss)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    @contextmanager
+    def measure(self):
+        """Yields a dict that gets 'peak_rss_mb' for the block"""
+        result = {}
+        self.peak = 0
+        self.sample()
+        try:
+            yield result
+        finally:
+            self.sample()
+            result['peak_rss_mb'] = round(self.peak / 2 ** 20, 1) if self.peak else None
+
+
+def run_stage(stages, name, pipeline, sampler, media_seconds, fn, segments=0):
+    """Time fn() as one stage and record wall time, throughput and peak RSS"""
+    with sampler.measure() as memory, pipeline.span(name):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+    stages[name] = {
+        'wall_seconds': round(elapsed, 3),
+        'realtime_factor': round(media_seconds / elapsed, 2) if elapsed else None,  # Media seconds per second
+        'segments_per_second': round(segments / elapsed, 2) if segments and elapsed else None,
+        'peak_rss_mb': memory['peak_rss_mb'],
+    }
+    return result
+
+
+def bench_pipeline(args, config):
+    """Run convert_video, transcription, generate_ai_subtitle and generate_dubbing on synthetic fixtures"""
+    from pipeline import DubbingPipeline
+    from workspace import JobWorkspace
+
+    # Measure the work itself: no caches or checkpoints from earlier runs
+    config.update({
+        'translation_memory': args.use_caches,
+        'tts_cache': args.use_caches,
+        'streaming_pipeline': False,
+        'tts_engine': 'edge-tts' if args.tts == 'stub' else args.tts,
+    })
+    languages = [lang.strip() for lang in args.languages.split(',') if lang.strip()]
+    ffmpeg_exe = DubbingPipeline('', '', [], config).tool_path('ffmpeg')
+    sampler = RssSampler()
+    sampler.start()
+    report = {
+        'engines': {'transcriber': args.transcriber, 'translator': args.translator, 'tts': args.tts},
+        'settings': {
+            'languages': languages,
+            'segments_per_minute': args.segments_per_minute,
+            'container': args.container,
+            'translate_latency_ms': args.translate_latency_ms,
+            'tts_latency_ms': args.tts_latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'seed': args.seed,
+        },
+        'runs': [],
+    }
+    try:
+        for minutes in args.minutes:
+            seconds = minutes * 60
+            started = time.perf_counter()
+            fixture_path, segments = make_fixture(args.fixtures_dir, seconds, args.segments_per_minute,
+                                                  ffmpeg_exe, args.container, args.seed)
+            fixture_seconds = time.perf_counter() - started
+            work_dir = tempfile.mkdtemp(prefix="pipeline_bench_")
+            try:
+                video_path = os.path.join(work_dir, os.path.basename(fixture_path))
+                shutil.copy2(fixture_path, video_path)
+                pipeline = DubbingPipeline(video_path, target_languages=languages, config=config,
+                                           job_id=f"bench_{minutes:g}m")
+                pipeline.workspace = JobWorkspace(pipeline.job_id, root=work_dir, output_dir=work_dir)
+                if args.verbose:
+                    pipeline.progress.connect(lambda message: print(message, file=sys.stderr))
+                tts = install_engines(pipeline, args, segments, work_dir, ffmpeg_exe)
+
+                stages = {}
+                started = time.perf_counter()
+                video_path = run_stage(stages, 'convert_video', pipeline, sampler, seconds,
+                                       lambda: pipeline.convert_video(video_path))
+                transcript = run_stage(stages, 'transcribe', pipeline, sampler, seconds,
+                                       lambda: pipeline.transcribe(video_path))
+                if not transcript:
+                    raise RuntimeError("Transcription failed")
+                transcript = pipeline.consolidate_transcript(transcript)  # As run() does before translation
+                for lang in languages:
+                    srt_path, translated = run_stage(
+                        stages, f'generate_ai_subtitle:{lang}', pipeline, sampler, seconds,
+                        lambda: pipeline.generate_ai_subtitle(video_path, lang, transcript),
+                        segments=len(transcript['segments']))
+                    if not translated:
+                        stages[f'generate_ai_subtitle:{lang}']['ok'] = False
+                        continue
+                    if tts:
+                        tts.prepare(segment.text for segment in translated)  # Untimed
+                    output = run_stage(
+                        stages, f'generate_dubbing:{lang}', pipeline, sampler, seconds,
+                        lambda: pipeline.generate_dubbing(video_path, srt_path, lang, config, subtitles=translated),
+                        segments=len(translated))
+                    stages[f'generate_dubbing:{lang}']['ok'] = bool(output)
+                pipeline.release_source_audio()
+                job = pipeline.report.to_dict()
+                report['runs'].append({
+                    'fixture': {
+                        'seconds': seconds,
+                        'segments': len(segments),
+                        'generate_seconds': round(fixture_seconds, 2),
+                    },
+                    'wall_seconds': round(time.perf_counter() - started, 3),
+                    'stages': stages,
+                    'totals': job['totals'],
+                    'spans': [span for span in job['spans'] if '/' in span['path']],  # Sub-stages
+                    'stub_tts_requests': tts.requests if tts else None,
+                })
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+    finally:
+        sampler.stop()
+    report['peak_rss_mb'] = round(sampler.overall / 2 ** 20, 1) if sampler.overall else None
+    child_peak = peak_child_rss()
+    report['peak_child_rss_mb'] = round(child_peak / 2 ** 20, 1) if child_peak else None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare_runs(report, json.load(f), args.max_regression)
+    return report
+
+
+def compare_runs(report, baseline, max_regression=0.2):
+    """Stages more than max_regression slower than in a baseline report (matched by fixture length)"""
+    before = {
+        (run['fixture']['seconds'], name): stage['wall_seconds']
+        for run in baseline.get('runs', []) for name, stage in run['stages'].items()
+    }
+    regressions = []
+    for run in report['runs']:
+        for name, stage in run['stages'].items():
+            old = before.get((run['fixture']['seconds'], name))
+            new = stage['wall_seconds']
+            # Ignore tiny absolute differences on very short stages
+            if old and new > old * (1 + max_regression) and new - old > 0.05:
+                regressions.append({
+                    'fixture_seconds': run['fixture']['seconds'],
+                    'stage': name,
+                    'baseline_seconds': old,
+                    'seconds': new,
+                    'ratio': round(new / old, 2),
+                })
+    return regressions
+
+
+# The regex parser and += writer the subtitle module replaced, kept as the baseline
+LEGACY_SRT_PATTERN = r'(\d+)\s+(\d{2}:\d{2}:\d{2},\d{3})\s+-->\s+(\d{2}:\d{2}:\d{2},\d{3})\s+([\s\S]*?)(?=\n\n|\Z)'
+
+
+def legacy_read_srt(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    cues = []
+    for _, start, end, text in re.findall(LEGACY_SRT_PATTERN, content):
+        cues.append({'start': subtitles.parse_timestamp(start), 'end': subtitles.parse_timestamp(end), 'text': text.strip()})
+    return cues
+
+
+def legacy_write_srt(path, cues):
+    content = ""
+    for i, cue in enumerate(cues):
+        content += f"{i+1}\n{subtitles.format_timestamp(cue['start'])} --> {subtitles.format_timestamp(cue['end'])}\n{cue['text']}\n\n"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def timed(fn, repeat):
+    """Best wall time of repeat calls, and the last result"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 4), result
+
+
+def allocated_mb(build):
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        value = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del value
+    return round(size / 2 ** 20, 1)
+
+
+def bench_subtitles(args, config):
+    """SRT/VTT write and parse speed of the subtitles module against the old code, plus segment memory"""
+    rng = random.Random(args.seed)
+    segments = []
+    position = 0.0
+    # Cue spacing keeps 100k cues under 100 hours: the legacy regex only
+    # matches two-digit hours and would silently skip the cues past that
+    for _ in range(args.cues):
+        position += rng.uniform(0.05, 0.3)
+        length = rng.uniform(0.8, 2.5)
+        lines = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 9))) for _ in range(rng.randint(1, 2))]
+        segments.append(Segment(round(position, 3), round(position + length, 3), "\n".join(lines)))
+        position += length
+    records = subtitles.to_records(segments)
+    dicts = [{'start': start, 'end': end, 'text': text} for start, end, text in records]
+
+    work_dir = tempfile.mkdtemp(prefix="subtitle_bench_")
+    try:
+        srt_path = os.path.join(work_dir, 'cues.srt')
+        vtt_path = os.path.join(work_dir, 'cues.vtt')
+        report = {'cues': args.cues, 'repeat': args.repeat}
+        report['write_srt_seconds'], _ = timed(lambda: subtitles.write_srt(srt_path, segments), args.repeat)
+        report['write_vtt_seconds'], _ = timed(lambda: subtitles.write_vtt(vtt_path, segments), args.repeat)
+        report['srt_mb'] = round(os.path.getsize(srt_path) / 2 ** 20, 1)
+        report['read_srt_seconds'], parsed_srt = timed(lambda: subtitles.read(srt_path), args.repeat)
+        report['read_vtt_seconds'], parsed_vtt = timed(lambda: subtitles.read(vtt_path), args.repeat)
+        report['round_trip_ok'] = parsed_srt == segments and parsed_vtt == segments
+        if not args.skip_legacy:
+            legacy_path = os.path.join(work_dir, 'legacy.srt')
+            report['legacy_write_srt_seconds'], _ = timed(lambda: legacy_write_srt(legacy_path, dicts), args.repeat)
+            report['legacy_read_srt_seconds'], legacy = timed(lambda: legacy_read_srt(srt_path), args.repeat)
+            report['legacy_cues_parsed'] = len(legacy)
+            if len(legacy) == len(segments):
+                report['read_speedup'] = round(report['legacy_read_srt_seconds'] / report['read_srt_seconds'], 2)
+            else:
+                # The legacy parser skipped cues, so compare the time per parsed cue
+                report['legacy_parse_incomplete'] = True
+                report['read_speedup_per_cue'] = round(
+                    (report['legacy_read_srt_seconds'] / max(1, len(legacy)))
+                    / (report['read_srt_seconds'] / len(parsed_srt)), 2)
+            report['write_speedup'] = round(report['legacy_write_srt_seconds'] / report['write_srt_seconds'], 2)
+        report['segment_list_mb'] = allocated_mb(lambda: subtitles.from_records(records))
+        report['dict_list_mb'] = allocated_mb(lambda: [dict(cue) for cue in dicts])
+        return report
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def minutes_list(value):
+    minutes = [float(item) for item in value.split(',') if item.strip()]
+    if not minutes or any(m <= 0 for m in minutes):
+        raise argparse.ArgumentTypeError("süreler pozitif dakika olmalı, ör. 1,10,60")
+    return minutes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Performans ölçümleri")
+    parser.add_argument('--config', default=config_manager.CONFIG_FILE, help="Ayar dosyası (config.json)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    transcribe = commands.add_parser('transcribe', help="Tek geçiş ve parçalı transkripsiyonu karşılaştır")
+    transcribe.add_argument('input', help="Ses veya video dosyası")
+    transcribe.add_argument('--workers', type=int, default=4)
+    transcribe.add_argument('--chunk-seconds', type=float, default=300)
+    transcribe.add_argument('--overlap-seconds', type=float, default=1.0)
+    transcribe.add_argument('--model', help="Whisper modeli (varsayılan: config)")
+    transcribe.add_argument('--skip-single', action='store_true', help="Tek geçiş ölçümünü atla")
+    transcribe.set_defaults(func=bench_transcribe)
+
+    startup = commands.add_parser('startup', help="İçe aktarma süreleri ve ilk pencere süresi")
+    startup.add_argument('--budget-seconds', type=float, default=1.5, help="İlk pencere için süre bütçesi")
+    startup.add_argument('--repeat', type=int, default=3)
+    startup.add_argument('--offscreen', action='store_true', help="Ekransız çalıştır (QT_QPA_PLATFORM=offscreen)")
+    startup.set_defaults(func=bench_startup)
+
+    pipeline = commands.add_parser('pipeline', help="Sentetik videolarla uçtan uca işlem hattı (ağ gerekmez)")
+    pipeline.add_argument('--minutes', type=minutes_list, default=[1.0, 10.0], help="Video süreleri, ör. 1,10,60,180")
+    pipeline.add_argument('--segments-per-minute', type=float, default=12, help="Konuşma segmenti yoğunluğu")
+    pipeline.add_argument('--languages', default="tr", help="Hedef diller, ör. tr,de")
+    pipeline.add_argument('--container', choices=sorted(FIXTURE_CODECS), default='mkv',
+                          help="mp4: dönüştürme atlanır, mkv: remux, webm: tam yeniden kodlama")
+    pipeline.add_argument('--transcriber', choices=['stub', 'whisper'], default='stub',
+                          help="whisper: gerçek model (sentetik seste metin anlamsızdır, yalnızca süre ölçülür)")
+    pipeline.add_argument('--translator', choices=['stub', 'google'], default='stub')
+    pipeline.add_argument('--tts', choices=['stub', 'edge-tts', 'elevenlabs'], default='stub')
+    pipeline.add_argument('--translate-latency-ms', type=float, default=200, help="Çeviri isteği başına gecikme")
+    pipeline.add_argument('--tts-latency-ms', type=float, default=300, help="TTS isteği başına gecikme")
+    pipeline.add_argument('--jitter-ms', type=float, default=100, help="Gecikmeye eklenen ± rastgele sapma")
+    pipeline.add_argument('--seed', type=int, default=0)
+    pipeline.add_argument('--fixtures-dir', default=os.path.join('cache', 'bench_fixtures'),
+                          help="Üretilen test videoları burada saklanır ve tekrar kullanılır")
+    pipeline.add_argument('--use-caches', action='store_true', help="Çeviri belleği ve TTS önbelleğini kullan")
+    pipeline.add_argument('--baseline', help="Karşılaştırılacak önceki sonuç dosyası (JSON)")
+    pipeline.add_argument('--max-regression', type=float, default=0.2, help="İzin verilen yavaşlama oranı")
+    pipeline.add_argument('--output', help="Sonucu ayrıca bu dosyaya yaz")
+    pipeline.add_argument('--verbose', action='store_true', help="İlerleme mesajlarını stderr'e yaz")
+    pipeline.set_defaults(func=bench_pipeline)
+
+    subtitle = commands.add_parser('subtitles', help="SRT/VTT okuma-yazma hızı ve segment belleği")
+    subtitle.add_argument('--cues', type=int, default=100000)
+    subtitle.add_argument('--repeat', type=int, default=3)
+    subtitle.add_argument('--seed', type=int, default=0)
+    subtitle.add_argument('--skip-legacy', action='store_true', help="Eski regex ayrıştırıcı ile karşılaştırmayı atla")
+    subtitle.set_defaults(func=bench_subtitles)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config_manager.CONFIG_FILE = args.config
+    config = config_manager.load_config()
+    if getattr(args, 'model', None):
+        config['whisper_model'] = args.model
+    report = args.func(args, config)
+    if getattr(args, 'output', None):
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+    print(json.dumps(report, indent=4, ensure_ascii=False))
+    return 1 if report.get('within_budget') is False or report.get('regressions') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import asyncio
+import subprocess
+import threading
+from contextlib import contextmanager
+
+
+class Cancelled(BaseException):
+    """Raised at a cancellation point once the job has been cancelled.
+
+    Derives from BaseException (like KeyboardInterrupt) so the pipeline's
+    broad `except Exception` handlers do not swallow it.
+    """
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared by every stage of one job.
+
+    Stages call check() between units of work. cancel() also kills the
+    subprocesses registered with track() and runs on_cancel callbacks, so
+    blocking work (ffmpeg, pending futures) stops without waiting for the
+    next check.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes = set()
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            processes = list(self._processes)
+            callbacks = list(self._callbacks)
+        for process in processes:
+            _kill(process)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Cancel callback error: {e}")
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+    @contextmanager
+    def track(self, process):
+        """Kill process if the token is cancelled while it runs"""
+        with self._lock:
+            self._processes.add(process)
+        if self._event.is_set():
+            _kill(process)
+        try:
+            yield process
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+    @contextmanager
+    def on_cancel(self, callback):
+        """Run callback on cancel() while the block is active"""
+        with self._lock:
+            self._callbacks.append(callback)
+        if self._event.is_set():
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.remove(callback)
+
+    @contextmanager
+    def interrupt(self, modules):
+        """Check the token before every forward() of the given torch modules.
+
+        Hooking the transformer blocks makes a running Whisper decode stop
+        within one block. Only the calling thread is interrupted, so jobs
+        sharing a pooled model do not cancel each other.
+        """
+        owner = threading.get_ident()
+
+        def hook(module, inputs):
+            if self._event.is_set() and threading.get_ident() == owner:
+                raise Cancelled()
+
+        handles = [module.register_forward_pre_hook(hook) for module in modules]
+        try:
+            yield
+        finally:
+            for handle in handles:
+                handle.remove()
+
+    def run(self, cmd, capture_output=False, text=False, check=False, **kwargs):
+        """subprocess.run() that kills the process when the token is cancelled"""
+        self.check()
+        if capture_output:
+            kwargs['stdout'] = kwargs['stderr'] = subprocess.PIPE
+        with subprocess.Popen(cmd, text=text, **kwargs) as process:
+            with self.track(process):
+                stdout, stderr = process.communicate()
+        self.check()  # A killed process is a cancellation, not a failure
+        if check and process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+    async def guard(self, awaitable, poll=0.1):
+        """Await awaitable, cancelling it within poll seconds of cancel()"""
+        task = asyncio.ensure_future(awaitable)
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll)
+            if done:
+                return task.result()
+            if self._event.is_set():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Cancelled, Exception):
+                    pass
+                raise Cancelled()
+
+
+def _kill(process):
+    try:
+        if process.poll() is None:
+            process.kill()
+    except Exception:
+        pass
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import threading
+
+MANIFEST_NAME = 'manifest.json'
+# TTS clips recorded between manifest writes; flush() writes the rest
+CLIP_SAVE_INTERVAL = 25
+
+
+def job_key(url, resolution=""):
+    """Deterministic workspace id for an input, so a rerun finds its checkpoints.
+
+    Local files are keyed by absolute path, size and mtime, so an edited
+    file starts over instead of resuming stale work.
+    """
+    if os.path.isfile(url):
+        st = os.stat(url)
+        source = f"file:{os.path.abspath(url)}:{st.st_size}:{int(st.st_mtime)}"
+    else:
+        source = f"url:{url.strip()}"
+    return hashlib.sha256(f"{source}|{resolution}".encode('utf-8')).hexdigest()[:16]
+
+
+class JobManifest:
+    """Per-job record of completed stages, stored as JSON in the job workspace.
+
+    Each stage maps to a dict of results (usually file names relative to the
+    workspace). A stage is only trusted while the files it names still
+    exist. Saves are atomic, so a crash never leaves a torn manifest.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self._lock = threading.RLock()
+        self._unsaved_clips = 0
+        self.stages = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.stages = json.load(f).get('stages', {})
+            except Exception as e:
+                print(f"Manifest load error: {e}")
+
+    def save(self):
+        with self._lock:
+            self._unsaved_clips = 0
+            temp_path = self.path + '.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'stages': self.stages}, f, indent=4, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+            except Exception as e:
+                print(f"Manifest save error: {e}")
+
+    def get(self, stage):
+        """Return the results of a completed stage, or None.
+
+        Values under the 'file' and 'files' keys must exist in the workspace.
+        """
+        with self._lock:
+            data = self.stages.get(stage)
+            if data is None:
+                return None
+            files = list(data.get('files', []))
+            if data.get('file'):
+                files.append(data['file'])
+            if not all(os.path.exists(self.resolve(name)) for name in files):
+                return None
+            return dict(data)
+
+    def done(self, stage, **data):
+        """Record stage as completed with its results"""
+        with self._lock:
+            self.stages[stage] = data
+            self.save()
+
+    def reset(self, stage):
+        with self._lock:
+            if self.stages.pop(stage, None) is not None:
+                self.save()
+
+    def reset_prefixed(self, *prefixes):
+        """Drop every stage whose name starts with one of prefixes, e.g. 'translate:'"""
+        with self._lock:
+            stages = [stage for stage in self.stages if stage.startswith(prefixes)]
+            for stage in stages:
+                del self.stages[stage]
+            if stages:
+                self.save()
+
+    def resolve(self, name):
+        """Absolute path of a workspace-relative name"""
+        return os.path.join(self.directory, name)
+
+    def relative(self, path):
+        return os.path.relpath(path, self.directory)
+
+    def save_json(self, stage, name, payload):
+        """Write payload to a workspace file and mark stage done with it"""
+        path = self.resolve(name)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        self.done(stage, file=name)
+
+    def load_json(self, stage):
+        """Payload written by save_json, or None if the stage is not done"""
+        data = self.get(stage)
+        if not data:
+            return None
+        try:
+            with open(self.resolve(data['file']), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Checkpoint read error ({stage}): {e}")
+            return None
+
+    def clips(self, language, voice):
+        """TTS clips already synthesized for language with this voice, as {index: text_hash}"""
+        with self._lock:
+            stage = self.stages.get(f"tts:{language}", {})
+            if stage.get('voice') != voice:
+                return {}
+            return {int(index): digest for index, digest in stage.get('clips', {}).items()}
+
+    def clip_done(self, language, index, voice, text):
+        """Record a synthesized clip and the text it speaks.
+
+        The manifest is written every CLIP_SAVE_INTERVAL clips; flush() writes the rest.
+        """
+        digest = text_hash(text)
+        with self._lock:
+            stage = self.stages.get(f"tts:{language}")
+            if not stage or stage.get('voice') != voice or 'clips' not in stage:
+                # A different voice (or an older checkpoint without text hashes) invalidates earlier clips
+                stage = self.stages[f"tts:{language}"] = {'voice': voice, 'clips': {}}
+            key = str(index)  # JSON object keys are strings
+            if stage['clips'].get(key) != digest:
+                stage['clips'][key] = digest
+                self._unsaved_clips += 1
+                if self._unsaved_clips >= CLIP_SAVE_INTERVAL:
+                    self.save()
+
+    def flush(self):
+        """Write clips recorded by clip_done since the last save"""
+        with self._lock:
+            if self._unsaved_clips:
+                self.save()
+
+
+def text_hash(text):
+    """Short digest of a clip's text; a clip is only reused for the same text"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+# Workspaces in use by running pipelines of this process
+_active = set()
+_active_lock = threading.Lock()
+
+
+def claim(key):
+    """Reserve a workspace key; False if another running job already uses it"""
+    with _active_lock:
+        if key in _active:
+            return False
+        _active.add(key)
+        return True
+
+
+def release(key):
+    with _active_lock:
+        _active.discard(key)
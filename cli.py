@@ -0,0 +1,194 @@
+"""Headless entry point: run the dubbing pipeline without the Qt GUI.
+
+Examples:
+    python cli.py https://youtu.be/VIDEO_ID --target-langs tr,en
+    python cli.py --manifest jobs.txt --jobs 4 --output-mode multitrack
+
+Progress is written to stdout as JSON lines. The exit code is 0 when every
+job succeeded, 1 when any job failed (including a job where some target
+language produced no output), 2 for usage errors and 130 when
+interrupted with Ctrl+C (running jobs are cancelled and can be resumed).
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config_manager
+from job_queue import configure_resources
+from pipeline import DubbingPipeline
+
+RESOLUTIONS = ["360p", "480p", "720p", "1080p", "best"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="YouTube/yerel video altyazı ve dublaj (GUI olmadan)")
+    parser.add_argument('inputs', nargs='*', help="YouTube URL'leri veya yerel video dosyaları")
+    parser.add_argument('--manifest', help="Her satırda bir girdi olan metin dosyası ya da JSON listesi")
+    parser.add_argument('--resolution', default="720p", choices=RESOLUTIONS)
+    parser.add_argument('--target-langs', default="",
+                        help="Virgülle ayrılmış hedef diller (örn. tr,en). Boşsa sadece orijinal altyazı")
+    parser.add_argument('--source-lang', help="Videonun konuşma dili (örn. en); verilirse Whisper dil algılamayı atlar")
+    parser.add_argument('--tts-engine', choices=["edge-tts", "elevenlabs"])
+    parser.add_argument('--voice-gender', choices=["auto", "male", "female"])
+    parser.add_argument('--prevent-overlap', dest='prevent_overlap', action='store_true', default=None)
+    parser.add_argument('--no-prevent-overlap', dest='prevent_overlap', action='store_false')
+    parser.add_argument('--output-mode', choices=["separate", "multitrack"])
+    parser.add_argument('--jobs', type=int, help="Aynı anda işlenecek iş sayısı (varsayılan: max_concurrent_jobs)")
+    parser.add_argument('--config', default=config_manager.CONFIG_FILE, help="Ayar dosyası (config.json)")
+    return parser.parse_args(argv)
+
+
+def split_languages(value):
+    if isinstance(value, list):
+        return [lang.strip() for lang in value if lang.strip()]
+    return [lang.strip() for lang in (value or "").split(',') if lang.strip()]
+
+
+def load_manifest(path, defaults):
+    """Read jobs from a manifest.
+
+    A .json manifest is a list of strings or objects with 'url' and optional
+    'resolution' / 'target_languages'. Any other file has one input per line;
+    blank lines and lines starting with '#' are ignored.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.lower().endswith('.json'):
+            entries = json.load(f)
+        else:
+            entries = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+    jobs = []
+    for entry in entries:
+        job = dict(defaults)
+        if isinstance(entry, dict):
+            job['url'] = entry['url']
+            job['resolution'] = entry.get('resolution', job['resolution'])
+            if 'target_languages' in entry:
+                job['target_languages'] = split_languages(entry['target_languages'])
+        else:
+            job['url'] = entry
+        jobs.append(job)
+    return jobs
+
+
+class JsonLinesReporter:
+    """Thread-safe JSON-lines writer for pipeline events"""
+
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        record = {'time': round(time.time(), 3), 'event': event}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def run_job(index, job, config, reporter, pipelines):
+    """Run one pipeline synchronously.
+
+    Returns True on success: the job finished and every requested target
+    language produced an output.
+    """
+    job_label = f"job{index + 1}"
+    outcome = {'ok': False}
+
+    pipeline = DubbingPipeline(job['url'], job['resolution'], job['target_languages'], dict(config))
+    pipelines.append(pipeline)
+    pipeline.progress.connect(lambda message: reporter.emit('progress', job=job_label, message=message))
+
+    def on_finished(video_path, subtitle_path):
+        failed_languages = list(pipeline.failed_languages)
+        outcome['ok'] = not failed_languages
+        reporter.emit('finished', job=job_label, input=job['url'], video=video_path, subtitle=subtitle_path,
+                      status=pipeline.report.status, failed_languages=failed_languages)
+
+    def on_error(message):
+        outcome['ok'] = False
+        reporter.emit('error', job=job_label, input=job['url'], message=message)
+
+    pipeline.finished.connect(on_finished)
+    pipeline.error.connect(on_error)
+
+    reporter.emit('started', job=job_label, input=job['url'],
+                  resolution=job['resolution'], target_languages=job['target_languages'])
+    started = time.time()
+    try:
+        pipeline.run()
+    except Exception as e:
+        on_error(str(e))
+    reporter.emit('done', job=job_label, ok=outcome['ok'], seconds=round(time.time() - started, 2))
+    return outcome['ok']
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    config_manager.CONFIG_FILE = args.config
+    config = config_manager.load_config()
+    overrides = {
+        'tts_engine': args.tts_engine,
+        'voice_gender_preference': args.voice_gender,
+        'prevent_overlap': args.prevent_overlap,
+        'output_mode': args.output_mode,
+    }
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    # Per run only: a source_language left in config.json must not apply to every job
+    config['source_language'] = args.source_lang or 'auto'
+
+    resolution = "En İyi" if args.resolution == "best" else args.resolution
+    defaults = {'resolution': resolution, 'target_languages': split_languages(args.target_langs)}
+    jobs = [dict(defaults, url=url) for url in args.inputs]
+    if args.manifest:
+        try:
+            jobs += load_manifest(args.manifest, defaults)
+        except Exception as e:
+            print(f"Manifest okunamadı: {e}", file=sys.stderr)
+            return 2
+    if not jobs:
+        print("Girdi yok: URL, dosya yolu veya --manifest verin.", file=sys.stderr)
+        return 2
+
+    for job in jobs:
+        # Report local inputs with absolute paths
+        if os.path.exists(job['url']):
+            job['url'] = os.path.abspath(job['url'])
+
+    configure_resources(config)
+    workers = max(1, args.jobs or int(config.get('max_concurrent_jobs', 2)))
+    reporter = JsonLinesReporter(sys.stdout)
+    # Pipeline debug prints go to stderr so stdout stays valid JSON lines
+    sys.stdout = sys.stderr
+    pipelines = []
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [executor.submit(run_job, index, job, config, reporter, pipelines) for index, job in enumerate(jobs)]
+    interrupted = False
+    try:
+        results = [future.result() for future in futures]
+    except KeyboardInterrupt:
+        # Ctrl+C: drop queued jobs and stop running ones at their next cancellation point
+        interrupted = True
+        reporter.emit('cancelled')
+        for future in futures:
+            future.cancel()
+        for pipeline in list(pipelines):
+            pipeline.cancel()
+        results = [False if future.cancelled() else future.result() for future in futures]
+    executor.shutdown()
+
+    failed = results.count(False)
+    reporter.emit('summary', total=len(results), succeeded=len(results) - failed, failed=failed)
+    if interrupted:
+        return 130
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
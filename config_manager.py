@@ -28,6 +28,55 @@ def get_default_config():
         "audio_codec": "aac",
         "video_quality": 23,  # CRF value (18-28, lower = higher quality)
         "audio_bitrate": "192k",
+        "output_mode": "separate",  # "separate": one MP4 per language, "multitrack": one MP4 with all languages
+        "keep_original_audio": True,  # multitrack: keep the original soundtrack as the first audio stream
+        "embed_subtitles": True,  # multitrack: add each SRT as a soft subtitle stream
+        "compatible_video_codecs": ["h264"],  # Copied without re-encoding
+        "compatible_audio_codecs": ["aac", "mp3"],  # Copied without re-encoding
+        # Whisper settings
+        "whisper_model": "base",  # "tiny", "base", "small", "medium", "large"
+        "whisper_device": "auto",  # "auto", "cpu", "cuda"
+        "whisper_precision": "auto",  # "auto", "fp16", "fp32"
+        "whisper_task": "transcribe",  # "transcribe", or "translate" for English text from any language
+        "whisper_pool_memory_mb": 4096,  # Memory budget for models kept warm
+        "whisper_pool_idle_seconds": 600,  # Unload models unused for this long
+        "audio_memmap_seconds": 3600,  # Decode longer sources to a memory-mapped file
+        "transcription_workers": 1,  # >1: transcribe silence-bounded chunks in this many processes
+        "transcription_chunk_seconds": 300,  # Target chunk length for parallel transcription
+        "transcription_overlap_seconds": 1.0,  # Audio shared by neighbouring chunks
+        # Dubbing mixer settings
+        "mixer_sample_rate": 24000,  # Sample rate of the dubbed track
+        "mixer_memmap_seconds": 1800,  # Use a disk-backed buffer for longer videos
+        "max_speed_rate": 2.0,  # Upper limit for prevent_overlap speed-up (values above 2.0 allowed)
+        # TTS request settings
+        "tts_concurrency": 4,  # Segments synthesized in parallel
+        "tts_requests_per_second": {"edge-tts": 10, "elevenlabs": 2},  # 0 = unlimited
+        "tts_cache": True,  # Reuse synthesized clips across runs
+        "tts_cache_dir": "cache/tts",
+        "tts_cache_max_mb": 1024,  # Oldest clips are evicted above this size
+        "elevenlabs_model_id": "eleven_multilingual_v2",
+        # Sentence merging: Whisper fragments are joined before translation and TTS
+        "segment_merge": True,
+        "segment_merge_max_seconds": 8.0,  # Longest merged segment
+        "segment_merge_max_chars": 120,  # Longest merged text (two subtitle lines)
+        "segment_merge_max_gap": 0.5,  # Pauses longer than this (seconds) always split
+        # Translation settings
+        "translation_memory": True,  # Reuse earlier translations across runs
+        "translation_memory_path": "cache/translation_memory.sqlite3",
+        "translation_batch_chars": 4500,  # Max characters per translation request
+        "translation_workers": 4,  # Batches translated in parallel
+        # Streaming: translate and dub each Whisper window while the next one is transcribed
+        "streaming_pipeline": False,
+        "streaming_window_seconds": 60,
+        # Instrumentation
+        "job_report": True,  # Write media/<video>.report.json with per-stage timings
+        "profiler": "",  # "", "cprofile" or "pyinstrument": profile the whole job next to the report
+        # Startup
+        "warmup_imports": True,  # Load torch/whisper/yt-dlp in the background after the window opens
+        # Job scheduling
+        "max_concurrent_jobs": 2,  # Jobs processed at the same time
+        "network_workers": 4,  # Concurrent download/translation/TTS stages
+        "cpu_workers": 1,  # Concurrent Whisper/ffmpeg stages
         # Multi-language settings
         "default_source_lang": "auto",
         "default_target_lang": "en",
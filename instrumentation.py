@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from cancellation import Cancelled
+
+
+class Span:
+    """One timed stage of a job: wall/CPU time plus counters (bytes, requests, cache hits)"""
+
+    __slots__ = ('name', 'path', 'start', 'wall', 'cpu', 'counters', 'attrs', 'status')
+
+    def __init__(self, name, path, start, attrs):
+        self.name = name
+        self.path = path
+        self.start = start
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.counters = {}
+        self.attrs = attrs
+        self.status = 'ok'
+
+    def add(self, **counters):
+        """Add to counters, e.g. span.add(bytes_written=n, network_requests=1)"""
+        for key, value in counters.items():
+            if value:
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self):
+        record = {
+            'name': self.name,
+            'path': self.path,
+            'start': round(self.start, 3),
+            'wall_seconds': round(self.wall, 3),
+            'cpu_seconds': round(self.cpu, 3),
+            'status': self.status,
+        }
+        record.update(self.counters)
+        if self.attrs:
+            record['attrs'] = self.attrs
+        return record
+
+
+class JobReport:
+    """Structured timing record of one pipeline run.
+
+    span() nests per thread, so 'language:tr' > 'tts' shows up as the path
+    'language:tr/tts'. CPU time is the thread's own time (time.thread_time);
+    work done in pool threads or worker processes is only in wall time.
+    Counters are summed over all spans into the job totals, so a counter
+    should be added at one level only.
+    """
+
+    def __init__(self, job_id=None, source=None):
+        self.job_id = job_id
+        self.source = source
+        self.started = time.time()
+        self._origin = time.perf_counter()
+        self.spans = []
+        self.outputs = []
+        self.status = 'running'  # running, finished, partial, failed, cancelled or stopped
+        self.failed_languages = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, **attrs):
+        stack = self._stack()
+        path = f"{stack[-1].path}/{name}" if stack else name
+        span = Span(name, path, time.perf_counter() - self._origin, attrs)
+        with self._lock:
+            self.spans.append(span)
+        stack.append(span)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = 'cancelled' if isinstance(e, Cancelled) else 'error'
+            raise
+        finally:
+            span.wall = time.perf_counter() - wall_start
+            span.cpu = time.thread_time() - cpu_start
+            stack.pop()
+
+    def count(self, **counters):
+        """Add counters to the innermost open span of the calling thread"""
+        stack = self._stack()
+        if stack:
+            stack[-1].add(**counters)
+
+    def to_dict(self):
+        with self._lock:
+            spans = [span.to_dict() for span in self.spans]
+            totals = {}
+            for span in self.spans:
+                for key, value in span.counters.items():
+                    totals[key] = totals.get(key, 0) + value
+        return {
+            'job_id': self.job_id,
+            'source': self.source,
+            'status': self.status,
+            'started': round(self.started, 3),
+            'wall_seconds': round(time.perf_counter() - self._origin, 3),
+            'outputs': list(self.outputs),
+            'failed_languages': list(self.failed_languages),
+            'totals': totals,
+            'stages': _stage_summary(spans),
+            'spans': spans,
+        }
+
+    def write(self, path):
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+            os.replace(temp_path, path)
+            return path
+        except Exception as e:
+            print(f"Job report write error: {e}")
+            return None
+
+
+def _stage_summary(spans):
+    """Wall time per top-level stage name (languages are summed per sub-stage)"""
+    summary = {}
+    for span in spans:
+        key = span['path'].split('/', 1)[-1] if span['path'].startswith('language:') else span['path']
+        summary[key] = round(summary.get(key, 0) + span['wall_seconds'], 3)
+    return summary
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+class Profiler:
+    """Optional whole-job profiler selected by config 'profiler': 'cprofile' or 'pyinstrument'.
+
+    Profiles the thread that runs the pipeline. pyinstrument is optional;
+    if it is not installed the profiler is disabled with a message.
+    """
+
+    def __init__(self, kind):
+        self.kind = (kind or "").lower()
+        self._profiler = None
+        if self.kind == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+        elif self.kind == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler as PyInstrumentProfiler
+                self._profiler = PyInstrumentProfiler()
+            except ImportError:
+                print("pyinstrument yüklü değil, profil alınmayacak (pip install pyinstrument)")
+
+    @property
+    def enabled(self):
+        return self._profiler is not None
+
+    def start(self):
+        if self.kind == 'cprofile' and self._profiler:
+            self._profiler.enable()
+        elif self._profiler:
+            self._profiler.start()
+
+    def stop(self, base_path):
+        """Stop and write base_path.prof (cProfile) or base_path.profile.html. Returns the file."""
+        if not self._profiler:
+            return None
+        try:
+            if self.kind == 'cprofile':
+                self._profiler.disable()
+                path = base_path + '.prof'
+                self._profiler.dump_stats(path)
+            else:
+                self._profiler.stop()
+                path = base_path + '.profile.html'
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(self._profiler.output_html())
+            return path
+        except Exception as e:
+            print(f"Profiler write error: {e}")
+            return None
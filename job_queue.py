@@ -0,0 +1,150 @@
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+QUEUE_FILE = os.path.join('media', '.jobs', 'queue.json')
+
+
+class JobQueue:
+    """Priority job queue persisted to a JSON file so it survives restarts.
+
+    Higher priority runs first; equal priorities run in submission order.
+    Jobs that were running when the process stopped are requeued on load.
+    Finished jobs are dropped from the file.
+    """
+
+    def __init__(self, path=QUEUE_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._jobs = {}
+        self._counter = itertools.count()
+        self.load()
+
+    def load(self):
+        with self._lock:
+            self._jobs = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        for job in json.load(f).get('jobs', []):
+                            if job.get('status') == 'running':
+                                job['status'] = 'pending'  # Interrupted, run again
+                            self._jobs[job['id']] = job
+                except Exception as e:
+                    print(f"Job queue load error: {e}")
+            seq = max((job.get('seq', 0) for job in self._jobs.values()), default=-1)
+            self._counter = itertools.count(seq + 1)
+
+    def save(self):
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.path + '.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'jobs': list(self._jobs.values())}, f, indent=4, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+            except Exception as e:
+                print(f"Job queue save error: {e}")
+
+    def add(self, url, resolution="720p", target_languages=None, priority=0, options=None):
+        with self._lock:
+            job = {
+                'id': uuid.uuid4().hex[:12],
+                'url': url,
+                'resolution': resolution,
+                'target_languages': list(target_languages or []),
+                'priority': priority,
+                'options': options or {},
+                'status': 'pending',
+                'seq': next(self._counter),
+                'created': time.time(),
+            }
+            self._jobs[job['id']] = job
+            self.save()
+            return dict(job)
+
+    def next_pending(self):
+        """Claim the highest-priority pending job and mark it running"""
+        with self._lock:
+            pending = [job for job in self._jobs.values() if job['status'] == 'pending']
+            if not pending:
+                return None
+            job = min(pending, key=lambda j: (-j.get('priority', 0), j.get('seq', 0)))
+            job['status'] = 'running'
+            job['started'] = time.time()
+            self.save()
+            return dict(job)
+
+    def complete(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self.save()
+
+    def requeue(self, job_id):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id]['status'] = 'pending'
+                self.save()
+
+    def pending_count(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job['status'] == 'pending')
+
+    def jobs(self):
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+
+class ResourcePool:
+    """Named concurrency limits shared by all jobs in the process.
+
+    'network' guards download, translation and TTS stages; 'cpu' guards
+    Whisper and ffmpeg work. A stage holds one slot of its class while it runs,
+    so one job's download overlaps another job's transcription.
+    """
+
+    def __init__(self, limits=None):
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._limits = {}
+        self.configure(limits or {'network': 4, 'cpu': 1})
+
+    def configure(self, limits):
+        with self._lock:
+            for name, limit in limits.items():
+                limit = max(1, int(limit))
+                if self._limits.get(name) != limit:
+                    # Holders release the semaphore they acquired, so swapping is safe
+                    self._semaphores[name] = threading.BoundedSemaphore(limit)
+                    self._limits[name] = limit
+
+    @contextmanager
+    def acquire(self, name):
+        with self._lock:
+            semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            yield
+            return
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+# Shared by every job in the process
+resources = ResourcePool()
+
+
+def configure_resources(config):
+    config = config or {}
+    resources.configure({
+        'network': config.get('network_workers', 4),
+        'cpu': config.get('cpu_workers', 1),
+    })
@@ -1,12 +1,43 @@
+import os
 import sys
-import torch # Fix for [WinError 1114] DLL load failed
-from PyQt5.QtWidgets import QApplication
-from main_window import MainWindow
+
+
+def preload_torch_dll():
+    """Fix for [WinError 1114] DLL load failed when torch is imported after PyQt5.
+
+    Loading torch's c10.dll before Qt is enough, so the torch package
+    itself can still be imported later, off the startup path. Falls back to
+    the full import if the DLL is not where we expect it.
+    """
+    try:
+        import ctypes
+        import importlib.util
+        spec = importlib.util.find_spec('torch')
+        if spec is None or not spec.origin:
+            return
+        dll_path = os.path.join(os.path.dirname(spec.origin), 'lib', 'c10.dll')
+        if os.path.exists(dll_path):
+            ctypes.CDLL(os.path.normpath(dll_path))
+            return
+    except OSError:
+        pass
+    import torch  # noqa: F401
+
 
 def main():
+    if sys.platform == 'win32':
+        preload_torch_dll()
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from main_window import MainWindow
+    from downloader import warm_up
+
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    # torch/whisper/yt-dlp load in the background once the window is up
+    if window.config.get('warmup_imports', True):
+        QTimer.singleShot(0, warm_up)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
@@ -212,10 +212,18 @@ class MainWindow(QMainWindow):
         self.current_video_path = None
         self.config = config_manager.load_config()
         self.load_settings_to_ui()
-        self.downloader = None
+        self.downloader = Downloader()
+        self.downloader.finished.connect(self.on_download_finished)
+        self.downloader.progress.connect(self.update_status)
+        self.downloader.error.connect(self.on_error)
+        self.downloader.idle.connect(self.on_queue_idle)
         
         # Initial log message
         self.add_log("Hazır")
+        
+        # Continue jobs left in the queue by a previous session
+        if self.downloader.resume_pending(self.config):
+            self.cancel_button.setEnabled(True)
 
     def start_download(self):
         url = self.url_input.text()
@@ -225,6 +233,12 @@ class MainWindow(QMainWindow):
             self.add_log("❌ HATA: Lütfen bir YouTube URL veya Dosya Yolu girin!")
             return
         
+        source_lang = self.source_lang_combo.currentData()
+        # Whisper gets the known source language and skips detection. Only the
+        # multi-dub combo names the spoken language; in single mode it is the
+        # dub target. Passed per job, so it is not saved to config.json.
+        job_options = {'source_language': source_lang if self.multi_dub_checkbox.isChecked() else 'auto'}
+        
         # Determine target language(s)
         if self.multi_dub_checkbox.isChecked():
             # Multi-language dubbing
@@ -237,7 +251,6 @@ class MainWindow(QMainWindow):
             self.add_log(f"🌐 Çoklu dublaj: {len(target_languages)} dil seçildi ({lang_names})")
         else:
             # Single language or no dubbing
-            source_lang = self.source_lang_combo.currentData()
             if source_lang == "auto":
                 target_languages = []  # Auto-detect, no dubbing
             else:
@@ -251,14 +264,10 @@ class MainWindow(QMainWindow):
         self.config['prevent_overlap'] = self.prevent_overlap_checkbox.isChecked()
 
         self.add_log("İşleniyor...")
-        self.download_button.setEnabled(False)
         self.cancel_button.setEnabled(True)
         
-        self.downloader = Downloader()
-        self.downloader.finished.connect(self.on_download_finished)
-        self.downloader.progress.connect(self.update_status)
-        self.downloader.error.connect(self.on_error)
-        self.downloader.download(url, resolution, target_languages, self.config)
+        # Jobs are queued; the button stays enabled so more URLs can be added
+        self.downloader.download(url, resolution, target_languages, self.config, options=job_options)
     
     def add_log(self, message):
         """Add message to log area with timestamp"""
@@ -272,12 +281,9 @@ class MainWindow(QMainWindow):
     
     def cancel_download(self):
         """Cancel ongoing download/dubbing process"""
-        if self.downloader and self.downloader.worker:
+        if self.downloader and self.downloader.is_busy():
             self.add_log("⚠️ İşlem iptal ediliyor...")
-            self.downloader.worker.terminate()
-            self.downloader.worker.wait()
-            self.add_log("❌ İşlem iptal edildi")
-            self.download_button.setEnabled(True)
+            self.downloader.cancel_all()
             self.cancel_button.setEnabled(False)
 
     def update_status(self, message): # Kept original name update_status
@@ -285,8 +291,6 @@ class MainWindow(QMainWindow):
 
     def on_download_finished(self, video_path, subtitle_path):
         self.add_log("✅ İndirme Tamamlandı!")
-        self.download_button.setEnabled(True)
-        self.cancel_button.setEnabled(False)
         self.current_video_path = video_path
         
         # Don't auto-open - user can manually open if needed
@@ -294,7 +298,9 @@ class MainWindow(QMainWindow):
 
     def on_error(self, message): # Kept original name message
         self.add_log(f"❌ HATA: {message}")
-        self.download_button.setEnabled(True)
+
+    def on_queue_idle(self):
+        self.add_log("📋 Kuyruk boş")
         self.cancel_button.setEnabled(False)
 
     def open_external_player(self):
@@ -383,10 +389,8 @@ class MainWindow(QMainWindow):
         """Show/hide multi-language checkbox group"""
         is_enabled = self.multi_dub_checkbox.isChecked()
         self.lang_checkboxes_group.setVisible(is_enabled)
-        if is_enabled:
-            self.source_lang_combo.setEnabled(False)
-        else:
-            self.source_lang_combo.setEnabled(True)
+        # The source combo stays enabled: in multi-dub mode it is the spoken language
+        self.on_source_lang_changed()
     
     def on_select_all_changed(self, state):
         """Select/deselect all language checkboxes"""
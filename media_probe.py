@@ -0,0 +1,199 @@
+import json
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+
+# yt-dlp codec prefixes -> ffprobe codec names
+YTDLP_CODECS = {
+    'avc1': 'h264',
+    'avc3': 'h264',
+    'hev1': 'hevc',
+    'hvc1': 'hevc',
+    'vp09': 'vp9',
+    'vp9': 'vp9',
+    'av01': 'av1',
+    'mp4a': 'aac',
+    'opus': 'opus',
+    'vorbis': 'vorbis',
+    'mp3': 'mp3',
+}
+
+
+def _ytdlp_codec(codec):
+    if not codec or codec == 'none':
+        return None
+    prefix = codec.split('.')[0].lower()
+    return YTDLP_CODECS.get(prefix, prefix)
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+class MediaProbe:
+    """Process-wide cache of media metadata, keyed by (path, size, mtime).
+
+    Entries use ffprobe's JSON layout ({'streams': [...], 'format': {...}})
+    plus a top-level 'duration', so every stage reads the same record. A
+    file is probed at most once while unchanged; yt-dlp's info dict can
+    seed an entry so downloads are not probed at all.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def probe(self, path, ffprobe_exe='ffprobe', run=subprocess.run):
+        """Return the metadata record for path, running ffprobe only on a cache miss.
+
+        run is a subprocess.run-compatible callable (e.g. CancelToken.run).
+        Returns None if the file is missing or cannot be probed.
+        """
+        try:
+            key = _file_key(path)
+        except OSError:
+            return None
+        entry = self._get(key)
+        if entry is not None:
+            return entry
+
+        cmd = [
+            ffprobe_exe,
+            '-v', 'error',
+            '-print_format', 'json',
+            '-show_streams',
+            '-show_format',
+            path
+        ]
+        try:
+            result = run(cmd, capture_output=True, text=True, check=True)
+            entry = json.loads(result.stdout)
+        except Exception as e:
+            print(f"Probe Error: {e}")
+            return None
+        try:
+            entry['duration'] = float(entry.get('format', {}).get('duration'))
+        except (TypeError, ValueError):
+            entry['duration'] = None
+        entry['source'] = 'ffprobe'
+        self._put(key, entry)
+        return entry
+
+    def seed(self, path, info):
+        """Create the record for a downloaded file from yt-dlp's info dict"""
+        try:
+            key = _file_key(path)
+        except OSError:
+            return None
+        formats = info.get('requested_formats') or [info]
+        streams = []
+        for fmt in formats:
+            video_codec = _ytdlp_codec(fmt.get('vcodec'))
+            if video_codec:
+                streams.append({
+                    'codec_type': 'video',
+                    'codec_name': video_codec,
+                    'width': fmt.get('width'),
+                    'height': fmt.get('height'),
+                    'avg_frame_rate': fmt.get('fps'),
+                })
+            audio_codec = _ytdlp_codec(fmt.get('acodec'))
+            if audio_codec:
+                streams.append({
+                    'codec_type': 'audio',
+                    'codec_name': audio_codec,
+                    'sample_rate': fmt.get('asr'),
+                    'channels': fmt.get('audio_channels'),
+                })
+        if not streams or not info.get('duration'):
+            return None  # Not enough to go on, ffprobe will fill it in
+        entry = {
+            'streams': streams,
+            'format': {'format_name': info.get('ext'), 'duration': info.get('duration')},
+            'duration': float(info['duration']),
+            'source': 'yt-dlp',
+        }
+        self._put(key, entry)
+        return entry
+
+    def alias(self, path, source_path):
+        """Reuse source_path's record for path (a stream-copy remux of it)"""
+        try:
+            source = self._get(_file_key(source_path))
+            key = _file_key(path)
+        except OSError:
+            return
+        if source is not None:
+            self._put(key, dict(source))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def video_stream(entry):
+    """First real video stream of a record (cover art excluded), or None"""
+    return next((st for st in (entry or {}).get('streams', []) if st.get('codec_type') == 'video'
+                 and not st.get('disposition', {}).get('attached_pic')), None)
+
+
+def audio_stream(entry):
+    return next((st for st in (entry or {}).get('streams', []) if st.get('codec_type') == 'audio'), None)
+
+
+def plan_transcode(entry, compatible_video=('h264',), compatible_audio=('aac', 'mp3')):
+    """Decide per stream whether to copy or re-encode for an MP4 output.
+
+    Returns (video_action, audio_action, reason) where each action is
+    'copy', 'encode' or None (stream absent).
+    """
+    if not entry:
+        return 'encode', 'encode', "codec bilgisi alınamadı"
+    
+    video = video_stream(entry)
+    audio = audio_stream(entry)
+    
+    reasons = []
+    video_action = None
+    if video:
+        codec = video.get('codec_name')
+        pix_fmt = video.get('pix_fmt', 'yuv420p')
+        if codec in compatible_video and pix_fmt in ('yuv420p', 'yuvj420p'):
+            video_action = 'copy'
+            reasons.append(f"video {codec} uyumlu")
+        else:
+            video_action = 'encode'
+            reasons.append(f"video {codec}/{pix_fmt} uyumsuz")
+    
+    audio_action = None
+    if audio:
+        codec = audio.get('codec_name')
+        if codec in compatible_audio:
+            audio_action = 'copy'
+            reasons.append(f"ses {codec} uyumlu")
+        else:
+            audio_action = 'encode'
+            reasons.append(f"ses {codec} uyumsuz")
+    
+    return video_action, audio_action, ", ".join(reasons)
+
+
+# Shared by every job in the process
+cache = MediaProbe()
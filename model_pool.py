@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict
+
+import torch
+import whisper
+
+# Approximate resident size (MB) of each Whisper checkpoint in fp32,
+# used to make room before a model is loaded
+MODEL_SIZES_MB = {
+    'tiny': 150,
+    'base': 290,
+    'small': 970,
+    'medium': 3100,
+    'large': 6200,
+    'large-v2': 6200,
+    'large-v3': 6200,
+    'turbo': 3200,
+}
+
+
+class WhisperModelPool:
+    """Process-wide registry that keeps loaded Whisper models warm across jobs.
+
+    Models are keyed by (model size, device, precision). Least recently used
+    models are evicted when the memory budget would be exceeded, and models
+    that have not been used for idle_timeout seconds are released.
+    """
+
+    def __init__(self, memory_budget_mb=4096, idle_timeout=600):
+        self.memory_budget_mb = memory_budget_mb
+        self.idle_timeout = idle_timeout
+        self._models = OrderedDict()  # key -> {'model', 'size_mb', 'last_used'}
+        self._lock = threading.RLock()
+        self._reaper = None
+
+    def configure(self, memory_budget_mb=None, idle_timeout=None):
+        with self._lock:
+            if memory_budget_mb is not None:
+                self.memory_budget_mb = memory_budget_mb
+            if idle_timeout is not None:
+                self.idle_timeout = idle_timeout
+            self._evict_idle()
+            self._evict_to_fit(0)
+
+    def resolve_key(self, size="base", device="auto", precision="auto"):
+        """Normalize (size, device, precision) to a concrete pool key"""
+        if not device or device == "auto":
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        if not precision or precision == "auto":
+            precision = "fp16" if device.startswith("cuda") else "fp32"
+        if precision == "fp16" and not device.startswith("cuda"):
+            precision = "fp32"  # fp16 inference is not supported on CPU
+        return (size, device, precision)
+
+    def get(self, size="base", device="auto", precision="auto"):
+        """Return a loaded model, loading it on first use"""
+        key = self.resolve_key(size, device, precision)
+        with self._lock:
+            self._evict_idle()
+            entry = self._models.get(key)
+            if entry is None:
+                self._evict_to_fit(MODEL_SIZES_MB.get(key[0], 1000))
+                entry = {'model': self._load(*key), 'size_mb': 0, 'last_used': 0}
+                entry['size_mb'] = self._model_size_mb(entry['model'])
+                self._models[key] = entry
+                self._start_reaper()
+            self._models.move_to_end(key)
+            entry['last_used'] = time.monotonic()
+            return entry['model']
+
+    def transcribe_options(self, size="base", device="auto", precision="auto"):
+        """Decode options matching the precision the model was loaded with"""
+        key = self.resolve_key(size, device, precision)
+        return {'fp16': key[2] == "fp16"}
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._free_device_memory()
+
+    def loaded_keys(self):
+        with self._lock:
+            return list(self._models.keys())
+
+    def _load(self, size, device, precision):
+        print(f"Whisper model yükleniyor: {size} ({device}, {precision})")
+        model = whisper.load_model(size, device=device)
+        if precision == "fp16":
+            model = model.half()
+        return model
+
+    def _model_size_mb(self, model):
+        total = sum(p.numel() * p.element_size() for p in model.parameters())
+        return total / (1024 * 1024)
+
+    def _used_mb(self):
+        return sum(entry['size_mb'] for entry in self._models.values())
+
+    def _evict_to_fit(self, needed_mb):
+        evicted = False
+        while self._models and self._used_mb() + needed_mb > self.memory_budget_mb:
+            key, _ = self._models.popitem(last=False)
+            print(f"Whisper model bellekten çıkarıldı (LRU): {key}")
+            evicted = True
+        if evicted:
+            self._free_device_memory()
+
+    def _evict_idle(self):
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        expired = [key for key, entry in self._models.items()
+                   if now - entry['last_used'] > self.idle_timeout]
+        for key in expired:
+            del self._models[key]
+            print(f"Whisper model bellekten çıkarıldı (boşta): {key}")
+        if expired:
+            self._free_device_memory()
+
+    def _free_device_memory(self):
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _start_reaper(self):
+        if self._reaper is not None or not self.idle_timeout:
+            return
+
+        def reap():
+            while True:
+                time.sleep(max(1, min(60, self.idle_timeout)))
+                with self._lock:
+                    self._evict_idle()
+
+        self._reaper = threading.Thread(target=reap, name="whisper-pool-reaper", daemon=True)
+        self._reaper.start()
+
+
+# Shared by every DownloaderWorker in the process
+pool = WhisperModelPool()
+
+
+def model_settings(config):
+    """Read (size, device, precision) from config"""
+    config = config or {}
+    return (
+        config.get('whisper_model', 'base'),
+        config.get('whisper_device', 'auto'),
+        config.get('whisper_precision', 'auto'),
+    )
+
+
+def get_model(config):
+    """Return the pooled Whisper model described by config"""
+    config = config or {}
+    pool.configure(
+        memory_budget_mb=config.get('whisper_pool_memory_mb'),
+        idle_timeout=config.get('whisper_pool_idle_seconds'),
+    )
+    return pool.get(*model_settings(config))
+
+
+def transcribe_options(config):
+    return pool.transcribe_options(*model_settings(config))
@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+import signal
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import audio_io
+from cancellation import CancelToken
+from subtitles import Segment
+
+# Set in each worker process by _init_worker
+_worker_settings = None
+
+
+def _init_worker(settings, threads, pids):
+    global _worker_settings
+    _worker_settings = settings
+    pids.put(os.getpid())  # So a cancel can terminate a worker mid-chunk
+    import torch
+    # Split the cores between workers instead of every process using all of them
+    torch.set_num_threads(threads)
+
+
+def _model():
+    import model_pool
+    return model_pool.pool.get(*_worker_settings)
+
+
+def _detect_language(samples):
+    import whisper
+    model = _model()
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(samples), model.dims.n_mels)
+    _, probs = model.detect_language(mel.to(model.device, dtype=next(model.parameters()).dtype))
+    return max(probs, key=probs.get)
+
+
+def _transcribe_chunk(samples, language, options):
+    result = _model().transcribe(samples, language=language, **options)
+    return [
+        {'start': segment['start'], 'end': segment['end'], 'text': segment['text']}
+        for segment in result['segments']
+    ]
+
+
+def _stop_workers(executor, futures, pids):
+    for future in futures:
+        future.cancel()
+    executor.shutdown(wait=False)
+    # Running chunks cannot be cancelled, so the worker processes (as
+    # reported by _init_worker) are terminated
+    while not pids.empty():
+        try:
+            os.kill(pids.get(), signal.SIGTERM)
+        except OSError:
+            pass  # Already exited
+
+
+def plan_chunks(samples, sample_rate=audio_io.SAMPLE_RATE, chunk_seconds=300, overlap_seconds=1.0):
+    """Split samples at silences into overlapping chunks.
+
+    Returns a list of (first_sample, last_sample, own_start_s, own_end_s).
+    Each chunk is padded by overlap_seconds on both sides; segments are kept
+    only by the chunk that owns their midpoint.
+    """
+    points = audio_io.find_split_points(samples, sample_rate, target_seconds=chunk_seconds)
+    overlap = int(overlap_seconds * sample_rate)
+    total = len(samples)
+    chunks = []
+    for index, (start, end) in enumerate(zip(points, points[1:])):
+        own_end = end / sample_rate if index < len(points) - 2 else float('inf')
+        chunks.append((max(0, start - overlap), min(total, end + overlap), start / sample_rate, own_end))
+    return chunks
+
+
+def stitch(chunk_results):
+    """Merge per-chunk segments into one timeline.
+
+    chunk_results: list of (offset_s, own_start_s, own_end_s, segments) in
+    chunk order, where segment times are relative to offset_s (worker
+    results are plain dicts). Returns a list of Segment. Segments
+    whose midpoint falls outside the chunk's own range came from the
+    overlap and are dropped; a repeated text straddling the cut is merged.
+    """
+    merged = []
+    for offset, own_start, own_end, segments in chunk_results:
+        for segment in segments:
+            text = segment['text'].strip()
+            start = offset + segment['start']
+            end = offset + segment['end']
+            middle = (start + end) / 2
+            if not text or middle < own_start or middle >= own_end:
+                continue
+            if merged and start < merged[-1].end:
+                if text == merged[-1].text:
+                    merged[-1].end = max(merged[-1].end, end)
+                    continue
+                start = merged[-1].end  # Keep the timeline monotonic
+            merged.append(Segment(start, max(start, end), text))
+    return merged
+
+
+def transcribe_chunked(samples, settings, options, workers=2, chunk_seconds=300, overlap_seconds=1.0,
+                       language=None, on_progress=None, cancel_token=None):
+    """Transcribe 16 kHz samples in a process pool, one silence-bounded chunk per task.
+
+    settings is the (size, device, precision) tuple from model_pool.model_settings
+    and options the decode options from model_pool.transcribe_options. Every
+    worker loads its own model once. Returns {'language', 'segments'} like
+    DubbingPipeline.transcribe. Cancelling cancel_token terminates the workers.
+    """
+    cancel_token = cancel_token or CancelToken()
+    sample_rate = audio_io.SAMPLE_RATE
+    chunks = plan_chunks(samples, sample_rate, chunk_seconds, overlap_seconds)
+    workers = max(1, min(int(workers), len(chunks)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn: forking a process that already has torch threads running can deadlock
+    context = multiprocessing.get_context('spawn')
+    pids = context.SimpleQueue()
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(settings, threads, pids)) as executor:
+        def wait_any(pending):
+            # Poll so a cancel is noticed while a chunk is still running
+            while True:
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                if cancel_token.cancelled:
+                    _stop_workers(executor, pending, pids)
+                    cancel_token.check()
+                if finished:
+                    return finished, pending
+
+        if language is None:
+            # One language for the whole video, otherwise chunks could disagree
+            future = executor.submit(_detect_language, np.array(samples[:30 * sample_rate]))
+            wait_any({future})
+            language = future.result()
+
+        futures = {
+            executor.submit(_transcribe_chunk, np.array(samples[first:last]), language, options): index
+            for index, (first, last, _, _) in enumerate(chunks)
+        }
+        results = [None] * len(chunks)
+        pending = set(futures)
+        while pending:
+            finished, pending = wait_any(pending)
+            for future in finished:
+                results[futures[future]] = future.result()
+            if on_progress:
+                on_progress(len(chunks) - len(pending), len(chunks))
+
+    return {
+        'language': language,
+        'segments': stitch([
+            (first / sample_rate, own_start, own_end, segments)
+            for (first, _, own_start, own_end), segments in zip(chunks, results)
+        ])
+    }
@@ -0,0 +1,1495 @@
+import os
+import shutil
+import json
+import yt_dlp
+import whisper
+from deep_translator import GoogleTranslator
+import edge_tts
+import asyncio
+import queue
+import threading
+from pydub import AudioSegment
+from elevenlabs.client import ElevenLabs
+import model_pool
+from audio_mixer import DubMixer, time_stretch
+from tts_batch import RateLimiter, run_bounded
+import translation_memory
+import tts_cache
+import audio_io
+import checkpoint
+from cancellation import CancelToken, Cancelled
+import parallel_transcribe
+import media_probe
+import instrumentation
+import subtitles as subtitle_io
+from subtitles import Segment
+from workspace import JobWorkspace
+from job_queue import resources
+
+DEFAULT_FFMPEG_DIR = r'C:\Users\melih\AppData\Local\Microsoft\WinGet\Links'
+# Transcript checkpoints written before the settings were recorded
+DEFAULT_TRANSCRIPT_SETTINGS = {'source_language': 'auto', 'task': 'transcribe'}
+
+
+class Signal:
+    """Minimal stand-in for pyqtSignal so the pipeline runs without Qt"""
+
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class DubbingPipeline:
+    """Download -> convert -> transcribe -> translate -> dub pipeline for one job.
+
+    Has no Qt dependency: progress, finished(video_path, subtitle_path) and
+    error are plain callback signals. DownloaderWorker runs it in a QThread
+    for the GUI; cli.py runs it headless.
+    """
+
+    def __init__(self, url, resolution="720p", target_languages=None, config=None, job_id=None):
+        self.finished = Signal() # video_path, subtitle_path
+        self.progress = Signal()
+        self.error = Signal()
+        self.url = url
+        self.job_id = job_id
+        self.workspace = None
+        self.resolution = resolution
+        # Accept both single language (string) or multiple languages (list)
+        if isinstance(target_languages, str):
+            self.target_languages = [target_languages] if target_languages else []
+        elif isinstance(target_languages, list):
+            self.target_languages = target_languages
+        else:
+            self.target_languages = []
+        self.config = config if config else {}  # Config for TTS engine selection
+        self.language_config = self.load_language_config()  # Load language configurations
+        # Decoded source soundtrack (16 kHz mono float32), shared between stages
+        self.source_audio = None
+        self.source_audio_path = None
+        self.source_audio_memmap = None
+        # Stage checkpoints; the workspace is kept when the job does not finish
+        self.manifest = None
+        self.workspace_key = None
+        self.keep_workspace = False
+        # Target languages that produced no output; the job goes on with the others
+        self.failed_languages = []
+        # Checked between stages and segments; cancel() also kills ffmpeg children
+        self.cancel_token = CancelToken()
+        # Per-stage spans, written as <video>.report.json next to the outputs
+        self.report = instrumentation.JobReport(job_id, url)
+        self.report_name = None
+
+    def cancel(self):
+        """Ask the running job to stop at the next cancellation point.
+
+        Outputs already published to media/ are kept, and the workspace is
+        kept too so the job can be resumed.
+        """
+        self.cancel_token.cancel()
+
+    def run(self):
+        """Run the job with a fresh report (and the optional profiler), then write the report"""
+        self.report = instrumentation.JobReport(self.job_id, self.url)
+        self.report_name = None
+        profiler = instrumentation.Profiler(self.config.get('profiler'))
+        profiler.start()
+        try:
+            self.run_stages()
+        finally:
+            self.write_report(profiler)
+
+    def write_report(self, profiler=None):
+        """Write <video>.report.json (and the profile, if enabled) to the output directory"""
+        output_dir = self.workspace.output_dir if self.workspace else 'media'
+        base_path = os.path.join(output_dir, self.report_name or f"job_{self.job_id}")
+        if profiler is not None and profiler.enabled:
+            profile_path = profiler.stop(base_path)
+            if profile_path:
+                self.report.outputs.append(os.path.abspath(profile_path))
+                self.progress.emit(f"📈 Profil kaydedildi: {os.path.basename(profile_path)}")
+        if not self.config.get('job_report', True):
+            return None
+        if self.report.status == 'running':
+            self.report.status = 'stopped'
+        os.makedirs(output_dir, exist_ok=True)
+        return self.report.write(base_path + '.report.json')
+
+    def span(self, name, **attrs):
+        """Time a stage in the job report: with self.span('tts') as span: ..."""
+        return self.report.span(name, **attrs)
+
+    def publish(self, path, copy=False):
+        """Move a finished file to media/ and list it in the job report"""
+        published = self.workspace.publish(path, copy=copy)
+        self.report.outputs.append(published)
+        return published
+
+    def run_stages(self):
+        # FFmpeg yolunu PATH'e ekle
+        ffmpeg_dir = self.config.get('ffmpeg_dir', DEFAULT_FFMPEG_DIR)
+        if ffmpeg_dir and ffmpeg_dir not in os.environ['PATH']:
+            os.environ['PATH'] += os.pathsep + ffmpeg_dir
+        
+        # FFmpeg kontrolü
+        if not shutil.which('ffmpeg'):
+            self.error.emit(f"FFmpeg bulunamadı! ({ffmpeg_dir})")
+            return
+
+        # İşe özel çalışma klasörü (media/.jobs/<girdi özeti>); aynı girdi
+        # tekrar çalıştırılırsa tamamlanan adımlar atlanır
+        key = checkpoint.job_key(self.url, self.resolution)
+        self.workspace_key = key if checkpoint.claim(key) else None
+        self.workspace = JobWorkspace(self.workspace_key or self.job_id)
+        self.job_id = self.job_id or self.workspace.job_id
+        self.manifest = checkpoint.JobManifest(self.workspace.path)
+        self.keep_workspace = False
+        self.failed_languages = []
+        if self.manifest.stages:
+            self.progress.emit("♻️ Yarım kalan iş bulundu, tamamlanan adımlar atlanacak")
+
+        # Çözünürlük ayarı
+        format_str = self.get_format_string()
+
+        try:
+            ydl_opts = {
+                'format': format_str,
+                'outtmpl': self.workspace.file('%(id)s.%(ext)s'),  # Çalışma klasörüne kaydet
+                'skip_download': False,
+                'progress_hooks': [self.progress_hook],
+                'ignoreerrors': True,
+                'continuedl': True,  # Resume .part files left by an interrupted run
+                'ffmpeg_location': os.path.dirname(shutil.which('ffmpeg')),
+            }
+
+            filename = None
+            downloaded = self.manifest.get('download')
+            converted = self.manifest.get('convert')
+            
+            with self.span('download') as span:
+                if converted or downloaded:
+                    self.progress.emit("♻️ Video önceki çalışmadan alındı")
+                    filename = self.manifest.resolve((converted or downloaded)['file'])
+                # Check if input is a local file
+                elif os.path.exists(self.url) and os.path.isfile(self.url):
+                    self.progress.emit(f"📂 Yerel dosya algılandı: {self.url}")
+                
+                    # Create a copy in the workspace to avoid modifying original
+                    base_name = os.path.basename(self.url)
+                    # Remove invalid characters for safety
+                    base_name = "".join([c for c in base_name if c.isalpha() or c.isdigit() or c in (' ', '.', '_', '-')]).rstrip()
+                    target_path = self.workspace.file(base_name)
+                
+                    try:
+                        shutil.copy2(self.url, target_path)
+                        span.add(bytes_read=instrumentation.file_size(target_path), bytes_written=instrumentation.file_size(target_path))
+                        filename = target_path
+                        self.progress.emit("Dosya kopyalandı, işleniyor...")
+                    except Exception as e:
+                        self.fail(f"Dosya kopyalama hatası: {e}")
+                        return
+                else:
+                    # It's a URL, download with yt-dlp
+                    self.progress.emit("Video indiriliyor...")
+                    with resources.acquire('network'):
+                        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                            info = ydl.extract_info(self.url, download=True)
+                            if not info:
+                                self.fail("Video bilgileri alınamadı.")
+                                return
+                            filename = ydl.prepare_filename(info)
+                            if os.path.exists(filename):
+                                media_probe.cache.seed(filename, info)  # No ffprobe needed for the download
+                        span.add(network_requests=1, bytes_written=instrumentation.file_size(filename))
+            
+            self.cancel_token.check()
+            if filename and not (converted or downloaded) and os.path.exists(filename):
+                self.manifest.done('download', file=self.manifest.relative(filename))
+            
+            if filename:
+                # 1. Videoyu MP4'e çevir (Evrensel uyumluluk için)
+                if converted:
+                    final_filename = filename
+                else:
+                    self.progress.emit("Video formatı dönüştürülüyor (MP4)...")
+                    with resources.acquire('cpu'), self.span('convert') as span:
+                        span.add(bytes_read=instrumentation.file_size(filename))
+                        final_filename = self.convert_video(filename)
+                        if final_filename != filename:
+                            span.add(bytes_written=instrumentation.file_size(final_filename))
+                    self.manifest.done('convert', file=self.manifest.relative(os.path.abspath(final_filename)))
+                final_filename = os.path.abspath(final_filename)
+                self.report_name = os.path.splitext(os.path.basename(final_filename))[0]
+                self.cancel_token.check()
+
+                # Akış modu: Whisper pencere pencere çalışırken çeviri ve TTS başlar
+                if self.target_languages and self.config.get('streaming_pipeline', False):
+                    with self.span('streaming'):
+                        subtitle_path = self.run_streaming(final_filename)
+                    final_filename = self.publish(final_filename, copy=self.keep_workspace)
+                    self.finish(final_filename, subtitle_path)
+                    return
+
+                # 2. Transkript (tüm diller için tek sefer)
+                transcript = self.manifest.load_json('transcript')
+                transcript_settings = self.transcript_settings()
+                if transcript and transcript.get('settings', DEFAULT_TRANSCRIPT_SETTINGS) != transcript_settings:
+                    transcript = None  # Made with a different source language or task
+                if transcript:
+                    transcript['segments'] = subtitle_io.from_records(transcript['segments'])
+                    self.progress.emit(f"♻️ Transkript önceki çalışmadan alındı ({transcript['language']})")
+                else:
+                    with resources.acquire('cpu'), self.span('transcribe'):
+                        transcript = self.transcribe(final_filename)
+                    if not transcript:
+                        self.fail("Transkript oluşturulamadı.")
+                        return
+                    # Translations, clips and outputs of an earlier transcript are stale now
+                    self.manifest.reset_prefixed('translate:', 'tts:', 'mix:', 'output:')
+                    self.manifest.save_json('transcript', 'transcript.json',
+                                            {'language': transcript['language'], 'settings': transcript_settings,
+                                             'segments': subtitle_io.to_records(transcript['segments'])})
+                # The checkpoint keeps Whisper's fragments; sentences are rebuilt
+                # from them for translation and dubbing only
+                if self.target_languages:
+                    transcript = self.consolidate_transcript(transcript)
+
+                # 3. Process each target language
+                subtitle_path = None  # Initialize
+                if self.target_languages:
+                    # multitrack: tek MP4, her dil ayrı ses (ve altyazı) izi
+                    multitrack = self.config.get('output_mode', 'separate') == 'multitrack'
+                    tracks = []
+                    for lang_index, target_lang in enumerate(self.target_languages):
+                        lang_info = self.language_config.get(target_lang, {})
+                        lang_name = lang_info.get('name', target_lang.upper())
+                        
+                        self.cancel_token.check()
+                        self.progress.emit(f"🌐 [{lang_index + 1}/{len(self.target_languages)}] {lang_name} işleniyor...")
+                        
+                        output = self.manifest.get(f'output:{target_lang}')
+                        if output and not multitrack and all(os.path.exists(path) for path in output['published']):
+                            self.progress.emit(f"♻️ {lang_name} önceki çalışmada tamamlanmış, atlanıyor")
+                            subtitle_path = output['published'][0]
+                            continue
+                        
+                        with self.span(f'language:{target_lang}'):
+                            try:
+                                # Generate subtitle for this language
+                                self.progress.emit(f"AI: {lang_name} altyazı oluşturuluyor...")
+                                current_subtitle, segments = self.generate_ai_subtitle(final_filename, target_lang, transcript)
+                            
+                                if current_subtitle:
+                                    subtitle_path = self.publish(current_subtitle)  # Track last successful
+                                
+                                    # Generate dubbing for this language
+                                    self.progress.emit(f"🎙️ {lang_name} dublaj oluşturuluyor...")
+                                    dubbed_video_path = self.generate_dubbing(final_filename, subtitle_path, target_lang, self.config, segments, mux=not multitrack)
+                                
+                                    if dubbed_video_path and multitrack:
+                                        tracks.append({'language': target_lang, 'audio': dubbed_video_path, 'subtitle': subtitle_path})
+                                        self.progress.emit(f"✅ {lang_name} dublaj izi hazır")
+                                    elif dubbed_video_path:
+                                        dubbed_video_path = self.publish(dubbed_video_path)
+                                        self.manifest.done(f'output:{target_lang}', published=[subtitle_path, dubbed_video_path])
+                                        self.progress.emit(f"✅ {lang_name} dublaj tamamlandı: {os.path.basename(dubbed_video_path)}")
+                                    else:
+                                        self.language_failed(target_lang, f"⚠️ {lang_name} dublaj oluşturulamadı")
+                                else:
+                                    self.language_failed(target_lang, f"⚠️ {lang_name} altyazı oluşturulamadı")
+                            except Exception as e:
+                                self.language_failed(target_lang, f"❌ {lang_name} hatası: {str(e)}")
+                    
+                    if multitrack and tracks:
+                        self.cancel_token.check()
+                        self.progress.emit(f"🎬 {len(tracks)} dil tek MP4 dosyasında birleştiriliyor...")
+                        with self.span('mux_multitrack'):
+                            multitrack_path = self.mux_multitrack(final_filename, tracks, self.config)
+                        if multitrack_path:
+                            multitrack_path = self.publish(multitrack_path)
+                            self.progress.emit(f"✅ Çok dilli video: {os.path.basename(multitrack_path)}")
+                        else:
+                            for track in tracks:
+                                self.language_failed(track['language'], f"⚠️ {track['language'].upper()} çok dilli videoya eklenemedi")
+                    
+                    # Return the original video and last subtitle
+                    final_filename = self.publish(final_filename, copy=self.keep_workspace)
+                    self.finish(final_filename, subtitle_path)
+                else:
+                    # No dubbing, just create original subtitle
+                    self.progress.emit("Yapay Zeka altyazı oluşturuyor (orijinal dil)...")
+                    subtitle_path, _ = self.generate_ai_subtitle(final_filename, None, transcript)
+                    
+                    if subtitle_path:
+                        subtitle_path = self.publish(subtitle_path)
+                    
+                    final_filename = self.publish(final_filename)
+                    self.finish(final_filename, subtitle_path)
+
+        except Cancelled:
+            self.keep_workspace = True
+            self.report.status = 'cancelled'
+            self.progress.emit("⛔ İş iptal edildi (tamamlanan çıktılar korundu)")
+        except Exception as e:
+            self.fail(str(e))
+        finally:
+            self.release_source_audio()
+            self.cleanup()
+
+    def fail(self, message):
+        """Report a job error and keep the workspace so a rerun can resume"""
+        self.keep_workspace = True
+        self.report.status = 'failed'
+        self.error.emit(message)
+
+    def language_failed(self, language, message):
+        """Record a target language that produced no output; the other languages go on"""
+        self.keep_workspace = True
+        if language not in self.failed_languages:
+            self.failed_languages.append(language)
+        self.progress.emit(message)
+
+    def finish(self, video_path, subtitle_path):
+        """Set the final job status and emit finished.
+
+        The status is 'partial' when some target languages failed and
+        'failed' when none of them produced an output; failed_languages
+        (also in the job report) lists them for callers such as cli.py.
+        """
+        self.report.failed_languages = list(self.failed_languages)
+        total = len(self.target_languages)
+        if not self.failed_languages:
+            self.report.status = 'finished'
+            if total:
+                self.progress.emit(f"🎉 Tüm dublajlar tamamlandı! ({total} dil)")
+        else:
+            self.report.status = 'failed' if len(self.failed_languages) >= total else 'partial'
+            self.progress.emit(f"⚠️ Dublaj bitti: {total - len(self.failed_languages)}/{total} dil başarılı "
+                               f"(başarısız: {', '.join(self.failed_languages)})")
+        self.finished.emit(video_path, subtitle_path if subtitle_path else "")
+
+    def tool_path(self, name):
+        """Resolve ffmpeg/ffprobe: the configured ffmpeg_dir first, then PATH"""
+        ffmpeg_dir = self.config.get('ffmpeg_dir', DEFAULT_FFMPEG_DIR)
+        if ffmpeg_dir:
+            for candidate in (name + '.exe', name):
+                path = os.path.join(ffmpeg_dir, candidate)
+                if os.path.isfile(path):
+                    return path
+        return shutil.which(name) or name
+
+    def cleanup(self):
+        """Remove this job's workspace once it has finished.
+
+        Failed jobs keep it (checkpoints, partial downloads) so running the
+        same input again resumes where it stopped.
+        """
+        if self.workspace:
+            if self.keep_workspace:
+                self.progress.emit(f"💾 Ara dosyalar devam için saklandı: {self.workspace.path}")
+            else:
+                self.workspace.cleanup()
+        if self.workspace_key:
+            checkpoint.release(self.workspace_key)
+            self.workspace_key = None
+
+    def get_format_string(self):
+        """yt-dlp format selector.
+
+        With a height limit H.264/AAC streams are preferred so convert_video can
+        remux instead of re-encoding. "En İyi" keeps the plain best streams,
+        since YouTube rarely offers avc1 above 1080p.
+        """
+        heights = {"1080p": 1080, "720p": 720, "480p": 480, "360p": 360}
+        height = heights.get(self.resolution)
+        if not height:
+            return 'bestvideo+bestaudio/best'
+        limit = f"[height<={height}]"
+        return (
+            f'bestvideo{limit}[vcodec^=avc1]+bestaudio[acodec^=mp4a]/'
+            f'bestvideo{limit}+bestaudio/best{limit}'
+        )
+    
+    def load_language_config(self):
+        """Load language configurations from languages.json"""
+        try:
+            config_path = 'languages.json'
+            if os.path.exists(config_path):
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    return data.get('languages', {})
+            else:
+                print("Warning: languages.json not found, using defaults")
+                return {}
+        except Exception as e:
+            print(f"Error loading language config: {e}")
+            return {}
+    
+    def whisper_language(self):
+        """Whisper code of the job's known source language (config 'source_language'), None to detect it"""
+        source = self.config.get('source_language') or 'auto'
+        if source == 'auto':
+            return None
+        return self.language_config.get(source, {}).get('whisper_code', source)
+
+    def transcript_language(self, whisper_code):
+        """Language of the transcript text, used as the translation source and in file names"""
+        if self.config.get('whisper_task', 'transcribe') == 'translate':
+            return 'en'  # Whisper translated the speech to English
+        source = self.config.get('source_language') or 'auto'
+        return whisper_code if source == 'auto' else source
+
+    def transcript_settings(self):
+        """Settings a transcript checkpoint was made with; a change redoes the transcript"""
+        return {'source_language': self.config.get('source_language') or 'auto',
+                'task': self.config.get('whisper_task', 'transcribe')}
+
+    def decode_options(self):
+        """Whisper decode options for this job (language is passed separately)"""
+        return dict(model_pool.transcribe_options(self.config), task=self.config.get('whisper_task', 'transcribe'))
+
+    def detect_language(self, video_path):
+        """Detect the spoken language (Whisper code) from the first 30 s of the shared in-memory audio.
+
+        Uses the pooled model; the result is cached on the file's media probe
+        record, so a file is only ever detected once.
+        """
+        info = self.probe_media(video_path)
+        if info and info.get('language'):
+            return info['language']
+        try:
+            audio = self.load_source_audio(video_path)
+            model = model_pool.get_model(self.config)
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels)
+            with self.interruptible(model):
+                _, probs = model.detect_language(mel.to(model.device, dtype=next(model.parameters()).dtype))
+            language = max(probs, key=probs.get)
+        except Exception as e:
+            print(f"Language detection error: {e}")
+            return "en"  # Default to English
+        if info is not None:
+            info['language'] = language
+        return language
+
+    def transcribe(self, video_path):
+        """Run Whisper once for the job and return the transcript as an in-memory segment list.
+
+        Returns a dict: {'language': str, 'segments': [Segment, ...]}
+        or None on failure. Every target language reuses this result.
+        """
+        try:
+            # 1. Sesi ayıkla (bellekte 16 kHz PCM)
+            self.progress.emit("AI: Ses videodan ayrıştırılıyor...")
+            with self.span('decode_audio') as span:
+                audio = self.load_source_audio(video_path)
+                span.add(samples=len(audio))
+            self.cancel_token.check()
+
+            # 2. Whisper ile Transkript (STT)
+            language = self.whisper_language()
+            if language:
+                self.progress.emit(f"AI: Kaynak dil: {language} (algılama atlandı)")
+            workers = int(self.config.get('transcription_workers', 1))
+            chunk_seconds = self.config.get('transcription_chunk_seconds', 300)
+            if workers > 1 and len(audio) > chunk_seconds * 1.5 * audio_io.SAMPLE_RATE:
+                with self.span('whisper', workers=workers):
+                    return self.transcribe_parallel(audio, workers, chunk_seconds, language)
+            
+            with self.span('whisper', model=self.config.get('whisper_model', 'base')) as span:
+                model = model_pool.get_model(self.config) # config: whisper_model ('tiny', 'base', 'small', 'medium', 'large')
+                if language is None:
+                    with self.span('detect_language'):
+                        language = self.detect_language(video_path)
+                    self.progress.emit(f"AI: Tespit edilen dil: {language}")
+                self.progress.emit("AI: Konuşmalar metne dökülüyor (Whisper)...")
+                with self.interruptible(model):
+                    result = model.transcribe(audio, language=language, **self.decode_options())
+                span.add(segments=len(result['segments']))
+            
+            detected_language = self.transcript_language(result.get('language') or language)
+            
+            segments = [
+                Segment(segment['start'], segment['end'], segment['text'].strip())
+                for segment in result['segments']
+            ]
+            return {'language': detected_language, 'segments': segments}
+
+        except Exception as e:
+            print(f"Transcription Error: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+    def merge_settings(self):
+        """segment_merge_* settings, or None with merging disabled; translation checkpoints are keyed on them"""
+        if not self.config.get('segment_merge', True):
+            return None
+        return {
+            'max_seconds': self.config.get('segment_merge_max_seconds', 8.0),
+            'max_chars': self.config.get('segment_merge_max_chars', 120),
+            'max_gap': self.config.get('segment_merge_max_gap', 0.5),
+        }
+
+    def merge_segments(self, segments):
+        """Merge fragments into sentences per config; returns (segments, groups) like subtitles.merge_sentences"""
+        settings = self.merge_settings()
+        if settings is None:
+            return segments, [(index, index) for index in range(len(segments))]
+        return subtitle_io.merge_sentences(segments, **settings)
+
+    def consolidate_transcript(self, transcript):
+        """Sentence-level transcript for translation and TTS.
+
+        Fewer, longer segments mean fewer TTS requests and smoother prosody.
+        Each sentence spans its first fragment's start to its last fragment's
+        end, so the slots prevent_overlap fits clips into are unchanged at
+        sentence boundaries. 'fragments' and 'groups' map back to Whisper's
+        original segments.
+        """
+        with self.span('merge_segments') as span:
+            segments, groups = self.merge_segments(transcript['segments'])
+            span.add(fragments=len(transcript['segments']), sentences=len(segments))
+        if len(segments) < len(transcript['segments']):
+            self.progress.emit(f"AI: {len(transcript['segments'])} parça {len(segments)} cümlede birleştirildi")
+        return dict(transcript, segments=segments, fragments=transcript['segments'], groups=groups)
+
+    def transcribe_parallel(self, audio, workers, chunk_seconds, language=None):
+        """Transcribe silence-bounded chunks in worker processes and stitch the results.
+
+        Without a known language the first worker detects it once for all chunks.
+        """
+        self.progress.emit(f"AI: Konuşmalar metne dökülüyor (Whisper, {workers} işlem)...")
+        result = parallel_transcribe.transcribe_chunked(
+            audio,
+            model_pool.model_settings(self.config),
+            self.decode_options(),
+            workers=workers,
+            chunk_seconds=chunk_seconds,
+            overlap_seconds=self.config.get('transcription_overlap_seconds', 1.0),
+            language=language,
+            on_progress=lambda done, total: self.progress.emit(f"AI: Whisper parçaları: {done}/{total}"),
+            cancel_token=self.cancel_token
+        )
+        if language is None:
+            self.progress.emit(f"AI: Tespit edilen dil: {result['language']}")
+        result['language'] = self.transcript_language(result['language'])
+        return result
+
+    def iter_transcript(self, video_path, window_seconds=60):
+        """Transcribe window by window, yielding (language, segments) as each window completes.
+
+        Windows are cut at silences; timestamps are shifted to the full
+        video.
+        """
+        with self.span('decode_audio'):
+            audio = self.load_source_audio(video_path)
+        model = model_pool.get_model(self.config)
+        options = self.decode_options()
+        points = audio_io.find_split_points(audio, target_seconds=window_seconds)
+        # One language for every window: the known source language, or detected once up front
+        language = self.whisper_language()
+        if language is None:
+            with resources.acquire('cpu'), self.span('detect_language'):
+                language = self.detect_language(video_path)
+            self.progress.emit(f"AI: Tespit edilen dil: {language}")
+        transcript_language = self.transcript_language(language)
+        
+        for index, (start, end) in enumerate(zip(points, points[1:])):
+            self.progress.emit(f"AI: Konuşmalar metne dökülüyor (Whisper) [{index + 1}/{len(points) - 1}]")
+            offset = start / audio_io.SAMPLE_RATE
+            self.cancel_token.check()
+            with resources.acquire('cpu'), self.span('whisper', window=index), self.interruptible(model):
+                result = model.transcribe(audio[start:end], language=language, **options)
+            
+            yield transcript_language, [
+                Segment(offset + segment['start'], offset + segment['end'], segment['text'].strip())
+                for segment in result['segments'] if segment['text'].strip()
+            ]
+
+    def run_streaming(self, video_path):
+        """Overlap transcription with translation, TTS and mixing.
+
+        A background thread runs Whisper window by window. Each finished window
+        is translated, synthesized and mixed right away for every target
+        language while the next window is transcribed. The last segment of a
+        window is held back until the next window arrives, so its overlap
+        slot (time until the next segment) is known. Returns the last subtitle path.
+        """
+        config = self.config
+        video_duration = self.get_video_duration(video_path)
+        if not video_duration:
+            self.progress.emit("❌ Dublaj: Video süresi alınamadı")
+            return None
+        
+        self.progress.emit("⚡ Akış modu: transkript, çeviri ve dublaj eş zamanlı yürütülüyor")
+        if self.manifest:
+            # Streaming segments differ from the batch transcript's, and the
+            # dubbed audio and outputs written here replace the batch ones
+            for target_lang in self.target_languages:
+                self.manifest.reset(f'mix:{target_lang}')
+                self.manifest.reset(f'output:{target_lang}')
+        windows = queue.Queue()
+        
+        def produce():
+            try:
+                for item in self.iter_transcript(video_path, config.get('streaming_window_seconds', 60)):
+                    windows.put(item)
+            except BaseException as e:  # Includes Cancelled
+                windows.put(e)
+            finally:
+                windows.put(None)
+        
+        producer = threading.Thread(target=produce, name=f"whisper-{self.job_id}", daemon=True)
+        producer.start()
+        
+        states = {}  # lang -> segments, held-back segment, mixer, voice
+        source_language = None
+        try:
+            while True:
+                item = windows.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                source_language, window = item
+                window, _ = self.merge_segments(window)  # Windows end at silences, so sentences do not straddle them
+                if not window:
+                    continue
+                
+                for target_lang in self.target_languages:
+                    self.cancel_token.check()
+                    state = states.get(target_lang)
+                    if state is False:
+                        continue  # Language already failed
+                    try:
+                        if state is None:
+                            # Voice is chosen from the first window's text
+                            voice, use_elevenlabs = self.select_dub_voice(window, target_lang, config)
+                            state = states[target_lang] = {
+                                'segments': [],
+                                'pending': [],
+                                'next_index': 0,
+                                'voice': voice,
+                                'use_elevenlabs': use_elevenlabs,
+                                'mixer': self.create_mixer(video_duration, target_lang, config),
+                            }
+                        
+                        with resources.acquire('network'):
+                            translated = self.translate_segments(window, target_lang, source_language)
+                        state['segments'] += translated
+                        
+                        ready = state['pending'] + translated[:-1]
+                        state['pending'] = translated[-1:]
+                        slot_ends = [segment.start for segment in ready[1:] + state['pending']]
+                        self.dub_segments(state, ready, slot_ends, target_lang)
+                    except Exception as e:
+                        self.language_failed(target_lang, f"❌ {target_lang.upper()} hatası: {str(e)}")
+                        if state:
+                            state['mixer'].close()
+                        states[target_lang] = False
+        finally:
+            producer.join()
+        
+        # Flush held-back segments and write the outputs
+        multitrack = config.get('output_mode', 'separate') == 'multitrack'
+        tracks = []
+        subtitle_path = None
+        base_name = os.path.splitext(video_path)[0]
+        for target_lang in self.target_languages:
+            lang_name = self.language_config.get(target_lang, {}).get('name', target_lang.upper())
+            state = states.get(target_lang)
+            if state is None:
+                self.language_failed(target_lang, f"⚠️ {lang_name} için konuşma bulunamadı")
+            if not state:
+                continue
+            try:
+                self.dub_segments(state, state['pending'], [video_duration], target_lang)
+                
+                srt_path = self.write_srt(f"{base_name}.{source_language}_{target_lang}.srt", state['segments'])
+                subtitle_path = self.publish(srt_path)
+                
+                output_path = self.finish_dubbing(state['mixer'], video_path, target_lang, [], mux=not multitrack, record_mix=False)
+                if output_path and multitrack:
+                    tracks.append({'language': target_lang, 'audio': output_path, 'subtitle': subtitle_path})
+                elif output_path:
+                    output_path = self.publish(output_path)
+                    self.progress.emit(f"✅ {lang_name} dublaj tamamlandı: {os.path.basename(output_path)}")
+                else:
+                    self.language_failed(target_lang, f"⚠️ {lang_name} dublaj oluşturulamadı")
+            except Exception as e:
+                self.language_failed(target_lang, f"❌ {lang_name} hatası: {str(e)}")
+        
+        if multitrack and tracks:
+            self.progress.emit(f"🎬 {len(tracks)} dil tek MP4 dosyasında birleştiriliyor...")
+            multitrack_path = self.mux_multitrack(video_path, tracks, config)
+            if multitrack_path:
+                multitrack_path = self.publish(multitrack_path)
+                self.progress.emit(f"✅ Çok dilli video: {os.path.basename(multitrack_path)}")
+            else:
+                for track in tracks:
+                    self.language_failed(track['language'], f"⚠️ {track['language'].upper()} çok dilli videoya eklenemedi")
+        
+        return subtitle_path
+
+    def dub_segments(self, state, segments, slot_ends, target_language):
+        """Synthesize and mix a batch of segments into a streaming language state"""
+        if not segments:
+            return
+        index_offset = state['next_index']
+        # Own clip namespace: streaming indices do not match the batch path's segments
+        tts_results = self.synthesize_tts(segments, state['voice'], state['use_elevenlabs'], target_language, self.config,
+                                          index_offset, clip_set=f"stream_{target_language}")
+        temp_files = self.mix_clips(state['mixer'], segments, tts_results, slot_ends, target_language, self.config, index_offset)
+        self.remove_files(temp_files)  # Clips are in the mix already
+        state['next_index'] += len(segments)
+
+    def interruptible(self, model):
+        """Let cancel() stop a running Whisper call within one transformer block"""
+        return self.cancel_token.interrupt(list(model.encoder.blocks) + list(model.decoder.blocks))
+
+    def load_source_audio(self, video_path):
+        """Decode the source soundtrack once and share it between stages.
+
+        ffmpeg pipes 16 kHz mono PCM straight into memory; inputs longer than
+        audio_memmap_seconds are backed by a memory-mapped file instead.
+        """
+        if self.source_audio is not None and self.source_audio_path == video_path:
+            return self.source_audio
+        
+        self.release_source_audio()
+        info = self.probe_media(video_path)
+        if info and not media_probe.audio_stream(info):
+            raise RuntimeError("Videoda ses akışı yok")
+        ffmpeg_exe = self.tool_path('ffmpeg')
+        memmap_path = None
+        duration = (info or {}).get('duration') or 0
+        if duration > self.config.get('audio_memmap_seconds', 3600):
+            memmap_path = self.workspace.file("source_audio.f32")
+        
+        self.source_audio = audio_io.load_audio(video_path, ffmpeg_exe, memmap_path=memmap_path, cancel_token=self.cancel_token)
+        self.source_audio_path = video_path
+        self.source_audio_memmap = memmap_path
+        return self.source_audio
+
+    def release_source_audio(self):
+        self.source_audio = None  # Drop the mapping before removing its file
+        self.source_audio_path = None
+        if self.source_audio_memmap:
+            self.remove_files([self.source_audio_memmap])
+            self.source_audio_memmap = None
+
+    def translate_segments(self, segments, target_language, source_language='auto', untranslated=None):
+        """Return a copy of the transcript segments translated to target_language.
+
+        Texts are deduplicated, sent in batches and looked up in the
+        persistent translation memory first. Texts that could not be
+        translated keep the source text and are added to untranslated.
+        """
+        # Get language info from config
+        lang_info = self.language_config.get(target_language, {})
+        lang_name = lang_info.get('name', target_language.upper())
+        translator_code = lang_info.get('translator_code', target_language)
+        
+        self.progress.emit(f"AI: {lang_name}'ye çevriliyor ve SRT oluşturuluyor...")
+        
+        memory = None
+        if self.config.get('translation_memory', True):
+            memory = translation_memory.get_memory(self.config.get('translation_memory_path', 'cache/translation_memory.sqlite3'))
+        
+        batches = 0
+        
+        def on_progress(done, total):
+            nonlocal batches
+            batches = total
+            self.progress.emit(f"AI: Çevriliyor %{int((done / total) * 100)}")
+        
+        # Çeviri (hata olursa orijinal metin kullanılır)
+        with self.span('translate', language=target_language) as span:
+            hits_before = memory.hits if memory else 0
+            texts = translation_memory.translate_texts(
+                [segment.text for segment in segments],
+                lambda: self.create_translator(translator_code),
+                source_language,
+                translator_code,
+                engine='google',
+                memory=memory,
+                max_chars=self.config.get('translation_batch_chars', 4500),
+                workers=self.config.get('translation_workers', 4),
+                on_progress=on_progress,
+                cancel_token=self.cancel_token,
+                untranslated=untranslated
+            )
+            span.add(segments=len(segments), network_requests=batches,
+                     translation_cache_hits=(memory.hits - hits_before) if memory else 0)
+        
+        return [segment.replace(text=text) for segment, text in zip(segments, texts)]
+
+    def create_translator(self, translator_code):
+        """Translator for one batch; anything with a translate(text) method works"""
+        return GoogleTranslator(source='auto', target=translator_code)
+
+    def write_srt(self, srt_path, segments):
+        """Write segments to an SRT file"""
+        return subtitle_io.write_srt(srt_path, segments)
+
+    def generate_ai_subtitle(self, video_path, target_language=None, transcript=None):
+        """Create the SRT for one language from the shared transcript.
+
+        Returns (srt_path, segments) so dubbing can consume the segments
+        without re-reading the SRT; (None, None) on failure.
+        """
+        try:
+            if transcript is None:
+                transcript = self.transcribe(video_path)
+                if not transcript:
+                    return None, None
+                if target_language:
+                    transcript = self.consolidate_transcript(transcript)
+            
+            detected_language = transcript['language']
+            
+            # 3. Çeviri ve SRT oluşturma
+            if target_language:
+                stage = f'translate:{target_language}'
+                merge = self.merge_settings()
+                saved = self.manifest.load_json(stage) if self.manifest else None
+                # Translated sentences only fit this run if they were merged the same way
+                if isinstance(saved, dict) and saved.get('merge') == merge:
+                    segments = subtitle_io.from_records(saved['segments'])
+                    self.progress.emit("♻️ Çeviri önceki çalışmadan alındı")
+                else:
+                    if self.manifest:
+                        # Clips, mix and outputs made from the old sentences are stale too
+                        for stale in ('tts', 'mix', 'output'):
+                            self.manifest.reset(f'{stale}:{target_language}')
+                    untranslated = []
+                    with resources.acquire('network'):
+                        segments = self.translate_segments(transcript['segments'], target_language, detected_language, untranslated)
+                    if untranslated:
+                        # Not checkpointed, so a rerun retries instead of keeping the source text
+                        self.keep_workspace = True
+                        self.progress.emit(f"⚠️ {len(untranslated)} metin çevrilemedi, orijinal metin kullanıldı")
+                    elif self.manifest:
+                        self.manifest.save_json(stage, f"segments_{target_language}.json",
+                                                {'merge': merge, 'segments': subtitle_io.to_records(segments)})
+                lang_suffix = f"{detected_language}_{target_language}"
+            else:
+                # No translation, use original language
+                self.progress.emit("AI: SRT oluşturuluyor (orijinal dil)...")
+                segments = transcript.get('fragments', transcript['segments'])  # Whisper's own timing, unmerged
+                lang_suffix = detected_language
+
+            # SRT Kaydet
+            base_name = os.path.splitext(video_path)[0]
+            srt_path = f"{base_name}.{lang_suffix}.srt"  # Dil suffix'i ile kaydet
+            self.write_srt(srt_path, segments)
+                
+            return srt_path, segments
+
+        except Exception as e:
+            print(f"AI Subtitle Error: {e}")
+            import traceback
+            traceback.print_exc()
+            return None, None
+
+    def format_timestamp(self, seconds):
+        """SRT timestamp (HH:MM:SS,mmm)"""
+        return subtitle_io.format_timestamp(seconds)
+
+    def probe_media(self, path):
+        """Return stream/format info from the shared probe cache, or None on failure"""
+        return media_probe.cache.probe(path, self.tool_path('ffprobe'), self.cancel_token.run)
+
+    def plan_transcode(self, input_path, probe):
+        """media_probe.plan_transcode with the configured compatible codecs"""
+        return media_probe.plan_transcode(
+            probe,
+            self.config.get('compatible_video_codecs', ['h264']),
+            self.config.get('compatible_audio_codecs', ['aac', 'mp3']),
+        )
+
+    def convert_video(self, input_path):
+        """Convert video to MP4 (H.264/AAC), copying streams that are already compatible"""
+        import subprocess
+        output_path = os.path.splitext(input_path)[0] + ".mp4"
+        ffmpeg_exe = self.tool_path('ffmpeg')
+        
+        # Get config settings
+        video_codec = self.config.get('video_codec', 'libx264')
+        audio_codec = self.config.get('audio_codec', 'aac')
+        video_quality = self.config.get('video_quality', 23)
+        audio_bitrate = self.config.get('audio_bitrate', '192k')
+        
+        video_action, audio_action, reason = self.plan_transcode(input_path, self.probe_media(input_path))
+        is_mp4 = os.path.splitext(input_path)[1].lower() == '.mp4'
+        
+        if is_mp4 and video_action != 'encode' and audio_action != 'encode':
+            self.progress.emit(f"🎞️ Dönüştürme atlandı: zaten MP4 ({reason})")
+            return input_path
+        
+        cmd = [ffmpeg_exe, '-i', input_path, '-map', '0:v:0?', '-map', '0:a:0?']
+        if video_action == 'copy':
+            cmd += ['-c:v', 'copy']
+        else:
+            cmd += [
+                '-c:v', video_codec,  # H.264 codec
+                '-preset', 'medium',  # Encoding speed/quality balance
+                '-crf', str(video_quality),  # Quality (18-28, lower = higher quality)
+                '-pix_fmt', 'yuv420p',
+            ]
+        if audio_action == 'copy':
+            cmd += ['-c:a', 'copy']
+        else:
+            cmd += [
+                '-c:a', audio_codec,  # AAC codec
+                '-b:a', audio_bitrate,  # Audio bitrate
+                '-ar', '44100',  # Sample rate
+            ]
+        
+        if video_action == 'copy' and audio_action != 'encode':
+            self.progress.emit(f"🎞️ Remux (stream copy): {reason}")
+        elif video_action == 'copy':
+            self.progress.emit(f"🎞️ Video kopyalanıyor, ses yeniden kodlanıyor: {reason}")
+        elif audio_action == 'copy':
+            self.progress.emit(f"🎞️ Video yeniden kodlanıyor, ses kopyalanıyor: {reason}")
+        else:
+            self.progress.emit(f"🎞️ Tam yeniden kodlama: {reason}")
+        
+        # Write to a temp file so an MP4 input can be replaced in place
+        temp_output = os.path.splitext(input_path)[0] + ".converting.mp4"
+        cmd += [
+            '-movflags', '+faststart',  # Web streaming optimization
+            '-y', temp_output
+        ]
+        try:
+            self.cancel_token.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            os.replace(temp_output, output_path)
+            if video_action != 'encode' and audio_action != 'encode':
+                media_probe.cache.alias(output_path, input_path)  # Same streams, no new probe
+            if input_path != output_path and os.path.exists(input_path):
+                try: os.remove(input_path)
+                except: pass
+            return output_path
+        except Exception:
+            if os.path.exists(temp_output):
+                try: os.remove(temp_output)
+                except: pass
+            return input_path
+
+    def progress_hook(self, d):
+        self.cancel_token.check()  # Aborts yt-dlp; the .part file stays for resume
+        if d['status'] == 'downloading':
+            p = d.get('_percent_str', '0%')
+            self.progress.emit(f"İndiriliyor: {p}")
+        elif d['status'] == 'finished':
+            self.progress.emit("İndirme bitti, işleniyor...")
+
+    def generate_dubbing(self, video_path, subtitle_path, target_language, config, subtitles=None, mux=True):
+        """Generate dubbed audio and merge with video.
+
+        With mux=False the dubbed audio track is returned instead, so several
+        languages can be muxed into one file by mux_multitrack.
+        """
+        try:
+            # Use in-memory segments when available, otherwise parse SRT file
+            if subtitles is None:
+                subtitles = self.parse_srt(subtitle_path)
+            if not subtitles:
+                self.progress.emit("❌ Dublaj: SRT dosyası okunamadı")
+                return None
+            
+            mixed = self.manifest.get(f'mix:{target_language}') if self.manifest else None
+            if mixed:
+                self.progress.emit("♻️ Dublaj sesi önceki çalışmadan alındı")
+                return self.mux_dubbed_audio(video_path, self.manifest.resolve(mixed['file']), target_language, [], mux)
+            
+            # Get video duration
+            video_duration = self.get_video_duration(video_path)
+            if not video_duration:
+                self.progress.emit("❌ Dublaj: Video süresi alınamadı")
+                return None
+            
+            voice, use_elevenlabs = self.select_dub_voice(subtitles, target_language, config)
+            mixer = self.create_mixer(video_duration, target_language, config)
+            
+            # Generate TTS for all subtitles concurrently (one event loop per language)
+            tts_results = self.synthesize_tts(subtitles, voice, use_elevenlabs, target_language, config)
+            
+            with resources.acquire('cpu'):
+                # Each clip may use the time until the next subtitle starts
+                slot_ends = [subtitle.start for subtitle in subtitles[1:]] + [video_duration]
+                temp_audio_files = self.mix_clips(mixer, subtitles, tts_results, slot_ends, target_language, config)
+                return self.finish_dubbing(mixer, video_path, target_language, temp_audio_files, mux)
+            
+        except Exception as e:
+            error_msg = f"Dubbing Error: {e}"
+            print(error_msg)
+            import traceback
+            traceback.print_exc()
+            self.progress.emit(f"❌ Dublaj hatası: {str(e)}")
+            return None
+    
+    def select_dub_voice(self, subtitles, target_language, config):
+        """Return (voice, use_elevenlabs) for the configured TTS engine"""
+        # Check TTS engine
+        tts_engine = config.get('tts_engine', 'edge-tts')
+        
+        # Select voice based on engine
+        if tts_engine == 'elevenlabs':
+            voice = self.select_elevenlabs_voice(subtitles, target_language, config)
+            self.progress.emit(f"Dublaj: ElevenLabs sesi - {voice}")
+            return voice, True
+        voice = self.select_voice(subtitles, target_language)
+        self.progress.emit(f"Dublaj: Edge-TTS sesi - {voice}")
+        return voice, False
+    
+    def create_mixer(self, video_duration, target_language, config):
+        """Create the mix buffer for one language's dubbed track"""
+        self.progress.emit("Dublaj: Ses tamponu oluşturuluyor...")
+        memmap_path = None
+        if video_duration > config.get('mixer_memmap_seconds', 1800):
+            memmap_path = self.workspace.file(f"dub_mix_{target_language}.f32")  # Uzun videolarda tamponu diskte tut
+        return DubMixer(video_duration, sample_rate=config.get('mixer_sample_rate', 24000), memmap_path=memmap_path)
+    
+    def synthesize_tts(self, subtitles, voice, use_elevenlabs, target_language, config, index_offset=0, clip_set=None):
+        """Synthesize clips for subtitles; returns paths (or exceptions) in subtitle order.
+
+        clip_set names the clip files and their checkpoint stage (default:
+        target_language).
+        """
+        self.progress.emit("Dublaj: TTS oluşturuluyor %0")
+        cache = tts_cache.get_cache(config)
+        cache_before = cache.stats() if cache else None
+        with resources.acquire('network'), self.span('tts', voice=voice) as span:
+            tts_results = asyncio.run(self.cancel_token.guard(
+                self.synthesize_segments(subtitles, voice, use_elevenlabs, target_language, config, index_offset, clip_set)
+            ))
+            clips = [path for path in tts_results if isinstance(path, str)]
+            span.add(clips=len(clips), failed_clips=len(tts_results) - len(clips),
+                     bytes_written=sum(instrumentation.file_size(path) for path in clips))
+            if cache:
+                cache_after = cache.stats()
+                # A cache miss is a request to the TTS service (shared cache: approximate under concurrent jobs)
+                span.add(tts_cache_hits=cache_after['hits'] - cache_before['hits'],
+                         network_requests=cache_after['misses'] - cache_before['misses'])
+        self.cancel_token.check()
+        if cache:
+            self.progress.emit(f"Dublaj: TTS önbelleği {cache_after['hits'] - cache_before['hits']} isabet, {cache_after['misses'] - cache_before['misses']} ıska")
+        return tts_results
+    
+    def mix_clips(self, mixer, subtitles, tts_results, slot_ends, target_language, config, index_offset=0):
+        """Mix synthesized clips into mixer at their subtitle start times.
+
+        slot_ends[i] is the latest time clip i should end at; with
+        prevent_overlap longer clips are sped up to fit. Returns the temp
+        files that were used.
+        """
+        temp_audio_files = [path for path in tts_results if isinstance(path, str)]
+        with self.span('mix') as span:
+            for i, subtitle in enumerate(subtitles):
+                self.cancel_token.check()
+                index = index_offset + i
+                start_time = subtitle.start
+                temp_tts_file = tts_results[i]
+            
+                if isinstance(temp_tts_file, Exception):
+                    error_msg = f"TTS Error for segment {index}: {temp_tts_file}"
+                    print(error_msg)
+                    self.progress.emit(error_msg)
+                    continue
+            
+                try:
+                    # Load TTS audio (decoded once, stretched in memory if needed)
+                    samples = mixer.segment_to_array(AudioSegment.from_mp3(temp_tts_file))
+                    tts_duration = len(samples) / mixer.sample_rate  # seconds
+                
+                    # Calculate available time slot
+                    max_duration = slot_ends[i] - start_time
+                
+                    # Check if TTS is too long
+                    prevent_overlap = config.get('prevent_overlap', True)
+                
+                    if prevent_overlap and tts_duration > max_duration and max_duration > 0.5: # Ensure max_duration is reasonable
+                        speed_rate = tts_duration / max_duration
+                        # Add 10% buffer and clamp between 1.0 and max_speed_rate
+                        speed_rate = min(max(speed_rate * 1.1, 1.0), config.get('max_speed_rate', 2.0))
+                    
+                        if speed_rate > 1.05: # Only speed up if significant
+                            self.progress.emit(f"⚠️ Hızlandırılıyor: {speed_rate:.2f}x (Segment {index+1})")
+                            samples = time_stretch(samples, speed_rate, mixer.sample_rate)
+                            span.add(time_stretched=1)
+                
+                    # Mix TTS audio into the track at its start time
+                    mixer.add(samples, start_time)
+                    span.add(clips=1)
+                
+                except Exception as e:
+                    error_msg = f"TTS Error for segment {index}: {e}"
+                    print(error_msg)
+                    self.progress.emit(error_msg)
+                    continue
+        
+        return temp_audio_files
+    
+    def finish_dubbing(self, mixer, video_path, target_language, temp_audio_files, mux=True, record_mix=True):
+        """Export the mix and mux it with the video (or return the audio track when mux=False).
+
+        record_mix=False skips the mix:<lang> checkpoint (streaming mixes do
+        not match the batch transcript a later run would resume).
+        """
+        # Export dubbed audio
+        self.progress.emit("Dublaj: Ses dosyası kaydediliyor...")
+        dubbed_audio_path = self.workspace.file(f"dubbed_audio_{target_language}.mp3")
+        ffmpeg_exe = self.tool_path('ffmpeg')
+        try:
+            with self.span('export') as span:
+                mixer.export(dubbed_audio_path, ffmpeg_exe, cancel_token=self.cancel_token)
+                span.add(bytes_written=instrumentation.file_size(dubbed_audio_path))
+        finally:
+            mixer.close()
+        if self.manifest and record_mix:
+            self.manifest.done(f'mix:{target_language}', file=self.manifest.relative(dubbed_audio_path))
+        
+        return self.mux_dubbed_audio(video_path, dubbed_audio_path, target_language, temp_audio_files, mux)
+    
+    def mux_dubbed_audio(self, video_path, dubbed_audio_path, target_language, temp_audio_files, mux=True):
+        """Replace the video's soundtrack with the dubbed audio (or return the audio when mux=False)"""
+        ffmpeg_exe = self.tool_path('ffmpeg')
+        if not mux:
+            self.remove_files(temp_audio_files)
+            return dubbed_audio_path
+        
+        # Merge dubbed audio with video
+        self.progress.emit("Dublaj: Video ile birleştiriliyor...")
+        base_name = os.path.splitext(video_path)[0]
+        dubbed_video_path = f"{base_name}_dubbed_{target_language}.mp4"
+        
+        cmd = [
+            ffmpeg_exe,
+            '-i', video_path,
+            '-i', dubbed_audio_path,
+            '-c:v', 'copy',  # Copy video stream
+            '-map', '0:v:0',  # Use video from first input
+            '-map', '1:a:0',  # Use audio from second input
+            # No -shortest: a yt-dlp duration is rounded to whole seconds and must not trim the video
+            '-y',
+            dubbed_video_path
+        ]
+        
+        with self.span('mux') as span:
+            span.add(bytes_read=instrumentation.file_size(video_path) + instrumentation.file_size(dubbed_audio_path))
+            result = self.cancel_token.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                self.progress.emit(f"❌ FFmpeg hatası: {result.stderr[:200]}")
+                return None
+            span.add(bytes_written=instrumentation.file_size(dubbed_video_path))
+        
+        # Cleanup temp files
+        self.remove_files(temp_audio_files + [dubbed_audio_path])
+        
+        return dubbed_video_path
+    
+    def mux_multitrack(self, video_path, tracks, config):
+        """Mux the video once with every dubbed track as a language-tagged audio stream.
+
+        tracks: [{'language', 'audio', 'subtitle'}, ...]. When embed_subtitles
+        is enabled each SRT is added as a soft (mov_text) subtitle stream.
+        """
+        ffmpeg_exe = self.tool_path('ffmpeg')
+        # Only map the original track when the source actually has one
+        keep_original = config.get('keep_original_audio', True) and media_probe.audio_stream(self.probe_media(video_path)) is not None
+        embed_subtitles = config.get('embed_subtitles', True)
+        
+        cmd = [ffmpeg_exe, '-i', video_path]
+        for track in tracks:
+            cmd += ['-i', track['audio']]
+        subtitle_tracks = [track for track in tracks if embed_subtitles and track.get('subtitle')]
+        for track in subtitle_tracks:
+            cmd += ['-i', track['subtitle']]
+        
+        cmd += ['-map', '0:v:0']
+        audio_index = 0
+        if keep_original:
+            cmd += ['-map', '0:a:0', '-metadata:s:a:0', 'title=Original']
+            audio_index = 1
+        for input_index, track in enumerate(tracks, start=1):
+            lang_info = self.language_config.get(track['language'], {})
+            cmd += [
+                '-map', f'{input_index}:a:0',
+                f'-metadata:s:a:{audio_index}', f"language={lang_info.get('iso639_2', track['language'])}",
+                f'-metadata:s:a:{audio_index}', f"title={lang_info.get('native_name', track['language'])}",
+            ]
+            audio_index += 1
+        for sub_index, track in enumerate(subtitle_tracks):
+            lang_info = self.language_config.get(track['language'], {})
+            cmd += [
+                '-map', f'{len(tracks) + 1 + sub_index}:s:0',
+                f'-metadata:s:s:{sub_index}', f"language={lang_info.get('iso639_2', track['language'])}",
+            ]
+        
+        # First dubbed track plays by default
+        first_dub = 1 if keep_original else 0
+        cmd += ['-disposition:a', '0', f'-disposition:a:{first_dub}', 'default']
+        cmd += [
+            '-c:v', 'copy',  # Video is copied once for all languages
+            '-c:a', 'aac',
+            '-b:a', config.get('audio_bitrate', '192k'),
+        ]
+        if keep_original:
+            cmd += ['-c:a:0', 'copy']
+        if subtitle_tracks:
+            cmd += ['-c:s', 'mov_text']
+        
+        base_name = os.path.splitext(video_path)[0]
+        output_path = f"{base_name}_dubbed_multi.mp4"
+        cmd += ['-movflags', '+faststart', '-y', output_path]
+        
+        with resources.acquire('cpu'):
+            result = self.cancel_token.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            self.progress.emit(f"❌ FFmpeg hatası: {result.stderr[:200]}")
+            return None
+        
+        self.remove_files([track['audio'] for track in tracks])
+        return output_path
+
+    def remove_files(self, paths):
+        for path in paths:
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except:
+                    pass
+
+    def parse_srt(self, srt_path):
+        """Parse SRT subtitle file"""
+        try:
+            return subtitle_io.read(srt_path)
+        except Exception as e:
+            print(f"SRT Parse Error: {e}")
+            return None
+    
+    def timestamp_to_seconds(self, timestamp):
+        """Convert SRT timestamp (HH:MM:SS,mmm) to seconds"""
+        return subtitle_io.parse_timestamp(timestamp)
+    
+    def get_video_duration(self, video_path):
+        """Get video duration in seconds from the shared media probe"""
+        info = self.probe_media(video_path)
+        return info.get('duration') if info else None
+
+    async def synthesize_segments(self, subtitles, voice, use_elevenlabs, target_language, config, index_offset=0, clip_set=None):
+        """Synthesize every subtitle on a single event loop with bounded concurrency.
+
+        Returns a list aligned with subtitles holding the clip path, or the
+        exception raised for that segment.
+        """
+        loop = asyncio.get_running_loop()
+        rates = config.get('tts_requests_per_second', {})
+        limiters = {
+            'edge-tts': RateLimiter(rates.get('edge-tts', 0)),
+            'elevenlabs': RateLimiter(rates.get('elevenlabs', 0)),
+        }
+        edge_voice = voice if not use_elevenlabs else None
+        fallback_lock = asyncio.Lock()
+        clip_set = clip_set or target_language
+        # Clips finished by an interrupted earlier run, as {index: text hash}
+        done_clips = self.manifest.clips(clip_set, voice) if self.manifest else {}
+        
+        async def get_edge_voice():
+            # Fallback voice is selected once, on the first ElevenLabs failure
+            nonlocal edge_voice
+            async with fallback_lock:
+                if edge_voice is None:
+                    self.progress.emit("Edge-TTS'e geçiliyor...")
+                    edge_voice = self.select_voice(subtitles, target_language)
+            return edge_voice
+        
+        async def synthesize(i, subtitle):
+            path = await synthesize_clip(i, subtitle)
+            if self.manifest:
+                self.manifest.clip_done(clip_set, index_offset + i, voice, subtitle.text)
+            return path
+        
+        async def synthesize_clip(i, subtitle):
+            self.cancel_token.check()
+            text = subtitle.text
+            temp_tts_file = self.workspace.file(f"tts_{clip_set}_{index_offset + i}.mp3")
+            if done_clips.get(index_offset + i) == checkpoint.text_hash(text) and os.path.exists(temp_tts_file):
+                return temp_tts_file
+            if use_elevenlabs:
+                # Try ElevenLabs
+                try:
+                    await limiters['elevenlabs'].wait()
+                    await loop.run_in_executor(None, self.generate_elevenlabs_tts, text, temp_tts_file, voice, config)
+                    return temp_tts_file
+                except Exception as e:
+                    # Log error and fallback to Edge-TTS
+                    error_msg = f"ElevenLabs hata: {str(e)}"
+                    print(error_msg)
+                    self.progress.emit(error_msg)
+            
+            # Use Edge-TTS
+            fallback_voice = await get_edge_voice()
+            await limiters['edge-tts'].wait()
+            await self.generate_edge_tts(text, temp_tts_file, fallback_voice)
+            return temp_tts_file
+        
+        def on_done(completed, total):
+            if completed % 5 == 0 or completed == total:
+                self.progress.emit(f"Dublaj: TTS oluşturuluyor %{int((completed / total) * 100)}")
+        
+        try:
+            return await run_bounded(subtitles, synthesize, config.get('tts_concurrency', 4), on_done)
+        finally:
+            if self.manifest:
+                self.manifest.flush()  # A crash loses at most CLIP_SAVE_INTERVAL clips of progress
+
+    async def generate_edge_tts(self, text, output_file, voice):
+        """Generate TTS using edge-tts (async)"""
+        cache = tts_cache.get_cache(self.config)
+        cache_key = tts_cache.TTSCache.make_key(text, voice, 'edge-tts')
+        if cache and cache.fetch(cache_key, output_file):
+            return
+        
+        communicate = edge_tts.Communicate(text, voice)
+        await communicate.save(output_file)
+        
+        if cache:
+            cache.store(cache_key, output_file)
+    
+    def select_voice(self, subtitles, target_language):
+        """Select appropriate voice based on target language and gender detection"""
+        
+        # Check if user has manual preference
+        user_preference = self.config.get('voice_gender_preference', 'auto')
+        
+        if user_preference == 'male':
+            is_male = True
+            self.progress.emit(f"🎭 Cinsiyet: Erkek (Manuel seçim)")
+        elif user_preference == 'female':
+            is_male = False
+            self.progress.emit(f"🎭 Cinsiyet: Kadın (Manuel seçim)")
+        else:
+            # Auto-detect
+            all_text = " ".join([sub.text for sub in subtitles]).lower()
+            
+            # Gender detection (improved heuristic)
+            male_indicators = ['bay', 'bey', 'erkek', 'adam', 'abi', 'ağabey', 'he', 'his', 'him', 'man', 'boy', 'mr', 'sir', 'gentleman']
+            female_indicators = ['bayan', 'hanım', 'kadın', 'abla', 'kız', 'she', 'her', 'woman', 'girl', 'ms', 'mrs', 'miss', 'lady', 'madam']
+            
+            male_score = sum(all_text.count(word) for word in male_indicators)
+            female_score = sum(all_text.count(word) for word in female_indicators)
+            
+            # More conservative: only use male voice if clearly male (2x more male indicators)
+            # Default to female voice when uncertain
+            is_male = male_score > (female_score * 2) and male_score > 2
+            
+            # Debug logging
+            gender = "Erkek" if is_male else "Kadın"
+            self.progress.emit(f"🎭 Cinsiyet algılama: {gender} (E:{male_score}, K:{female_score})")
+        
+        # Get voice from language config
+        lang_info = self.language_config.get(target_language, {})
+        edge_voices = lang_info.get('edge_tts', {})
+        
+        if edge_voices:
+            selected_voice = edge_voices.get('male' if is_male else 'female', 'en-US-GuyNeural')
+        else:
+            # Fallback to default voices
+            if target_language == 'tr':
+                selected_voice = "tr-TR-AhmetNeural" if is_male else "tr-TR-EmelNeural"
+            else:
+                selected_voice = "en-US-GuyNeural" if is_male else "en-US-JennyNeural"
+        
+        self.progress.emit(f"🎤 Seçilen ses: {selected_voice}")
+        return selected_voice
+    
+    def generate_elevenlabs_tts(self, text, output_file, voice_id, config):
+        """Generate TTS using ElevenLabs API"""
+        try:
+            model_id = config.get('elevenlabs_model_id', 'eleven_multilingual_v2')
+            cache = tts_cache.get_cache(config)
+            cache_key = tts_cache.TTSCache.make_key(text, voice_id, 'elevenlabs', model_id)
+            if cache and cache.fetch(cache_key, output_file):
+                return
+            
+            api_key = config.get('elevenlabs_api_key', '')
+            if not api_key:
+                raise Exception("API key boş! Lütfen ayarlardan ElevenLabs API key'inizi girin.")
+            
+            # Initialize ElevenLabs client
+            client = ElevenLabs(api_key=api_key)
+            
+            # Generate audio using text_to_speech
+            audio_generator = client.text_to_speech.convert(
+                text=text,
+                voice_id=voice_id,
+                model_id=model_id
+            )
+            
+            # Save audio to file (audio_generator is an iterator of bytes)
+            with open(output_file, 'wb') as f:
+                for chunk in audio_generator:
+                    f.write(chunk)
+            
+            if cache:
+                cache.store(cache_key, output_file)
+            
+        except Exception as e:
+            error_str = str(e)
+            if "api_key" in error_str.lower() or "unauthorized" in error_str.lower():
+                raise Exception(f"Geçersiz API key! Lütfen ayarlarınızı kontrol edin. Hata: {error_str}")
+            elif "quota" in error_str.lower() or "limit" in error_str.lower():
+                raise Exception(f"ElevenLabs kota aşıldı! Hata: {error_str}")
+            else:
+                raise Exception(f"ElevenLabs API hatası: {error_str}")
+    
+    def select_elevenlabs_voice(self, subtitles, target_language, config):
+        """Select ElevenLabs voice based on language and gender"""
+        all_text = " ".join([sub.text for sub in subtitles]).lower()
+        
+        # Gender detection
+        male_indicators = ['bay', 'bey', 'erkek', 'adam', 'abi', 'ağabey', 'he', 'his', 'him', 'man', 'boy', 'mr']
+        female_indicators = ['bayan', 'hanım', 'kadın', 'abla', 'kız', 'she', 'her', 'woman', 'girl', 'ms', 'mrs']
+        
+        male_score = sum(all_text.count(word) for word in male_indicators)
+        female_score = sum(all_text.count(word) for word in female_indicators)
+        
+        is_male = male_score > female_score * 1.5
+        
+        # Check if using custom voices
+        use_custom = config.get('use_custom_voices', False)
+        
+        if use_custom:
+            # Use custom voice IDs (for TR and EN only, for now)
+            custom_voices = config.get('custom_voice_ids', {})
+            if target_language == 'tr':
+                voice_id = custom_voices.get('tr_male' if is_male else 'tr_female', '')
+            elif target_language == 'en':
+                voice_id = custom_voices.get('en_male' if is_male else 'en_female', '')
+            else:
+                voice_id = ''
+            
+            # If custom voice is empty, fallback to language config
+            if not voice_id:
+                lang_info = self.language_config.get(target_language, {})
+                elevenlabs_voices = lang_info.get('elevenlabs', {})
+                return elevenlabs_voices.get('male' if is_male else 'female', 'pNInz6obpgDQGcFmaJgB')
+            return voice_id
+        else:
+            # Use voices from language config
+            lang_info = self.language_config.get(target_language, {})
+            elevenlabs_voices = lang_info.get('elevenlabs', {})
+            
+            if elevenlabs_voices:
+                return elevenlabs_voices.get('male' if is_male else 'female', 'pNInz6obpgDQGcFmaJgB')
+            else:
+                # Fallback to default multilingual voice
+                return 'pNInz6obpgDQGcFmaJgB'
@@ -2,9 +2,70 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtMultimediaWidgets import QVideoWidget
 from PyQt5.QtCore import QUrl, Qt, QTimer
-import webvtt
 import os
-import re
+from bisect import bisect_right
+
+import subtitles
+
+
+class CueTimeline:
+    """Subtitle cues (subtitles.Segment) sorted by start time, looked up with bisect.
+
+    index_at() keeps a cursor on the last cue that started, so during
+    normal playback a lookup only checks the current and the next cue;
+    a seek (or any bigger jump) falls back to a binary search. When cues
+    overlap, the active cue that started last wins.
+    """
+
+    def __init__(self, cues=()):
+        cues = sorted(cues, key=lambda cue: cue.start)
+        # Milliseconds, the unit of QMediaPlayer positions
+        self.starts = [round(cue.start * 1000) for cue in cues]
+        self.ends = [round(cue.end * 1000) for cue in cues]
+        self.texts = [cue.text for cue in cues]
+        # max_ends[i]: latest end among cues 0..i, to find cues still running under later ones
+        self.max_ends = []
+        latest = None
+        for end in self.ends:
+            latest = end if latest is None else max(latest, end)
+            self.max_ends.append(latest)
+        self.cursor = -1  # Last cue with start <= position
+
+    def __len__(self):
+        return len(self.starts)
+
+    def seek(self, position):
+        self.cursor = bisect_right(self.starts, position) - 1
+        return self.cursor
+
+    def index_at(self, position):
+        """Index of the cue shown at position (ms), or -1"""
+        starts = self.starts
+        count = len(starts)
+        cursor = self.cursor
+        if cursor >= 0 and position < starts[cursor]:
+            cursor = self.seek(position)  # Jumped backwards
+        elif cursor + 1 < count and position >= starts[cursor + 1]:
+            if cursor + 2 < count and position >= starts[cursor + 2]:
+                cursor = self.seek(position)  # Jumped forwards
+            else:
+                cursor = self.cursor = cursor + 1  # Playback moved on to the next cue
+        
+        if cursor < 0:
+            return -1
+        if position <= self.ends[cursor]:
+            return cursor
+        # Rare: an earlier, longer cue may still be running
+        index = cursor - 1
+        while index >= 0 and self.max_ends[index] >= position:
+            if self.ends[index] >= position:
+                return index
+            index -= 1
+        return -1
+
+    def text(self, index):
+        return self.texts[index]
+
 
 class VideoPlayer(QWidget):
     def __init__(self):
@@ -26,7 +87,9 @@ class VideoPlayer(QWidget):
         self.media_player.setVideoOutput(self.video_widget)
         self.media_player.positionChanged.connect(self.on_position_changed)
 
-        self.subtitles = [] # List of (start_ms, end_ms, text)
+        self.subtitles = [] # List of subtitles.Segment
+        self.timeline = CueTimeline()
+        self.current_cue = -1  # Index shown in subtitle_label, -1 when hidden
 
     def load_video(self, video_path, subtitle_path):
         print(f"DEBUG: Player loading video: {video_path}")
@@ -49,7 +112,7 @@ class VideoPlayer(QWidget):
         else:
             print("DEBUG: No subtitle loaded.")
             self.subtitles = []
-            self.subtitle_label.hide()
+            self.reset_timeline()
 
     def handle_errors(self):
         print(f"ERROR: MediaPlayer Error: {self.media_player.errorString()}")
@@ -57,68 +120,38 @@ class VideoPlayer(QWidget):
     def load_subtitles(self, path):
         self.subtitles = []
         try:
-            if path.endswith('.vtt'):
-                for caption in webvtt.read(path):
-                    # webvtt-py caption.start and .end are in string format "HH:MM:SS.mmm"
-                    start_ms = self.time_to_ms(caption.start)
-                    end_ms = self.time_to_ms(caption.end)
-                    self.subtitles.append((start_ms, end_ms, caption.text))
-            elif path.endswith('.srt'):
-                self.parse_srt(path)
+            if path.endswith(('.vtt', '.srt')):
+                self.subtitles = subtitles.read(path)
         except Exception as e:
             print(f"Altyazı yükleme hatası: {e}")
+        self.reset_timeline()
 
-    def parse_srt(self, path):
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Basit SRT parser
-        pattern = re.compile(r'(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n((?:(?!\n\n).)*)', re.DOTALL)
-        
-        for match in pattern.finditer(content):
-            start_str = match.group(2).replace(',', '.')
-            end_str = match.group(3).replace(',', '.')
-            text = match.group(4).strip()
-            
-            start_ms = self.time_to_ms(start_str)
-            end_ms = self.time_to_ms(end_str)
-            self.subtitles.append((start_ms, end_ms, text))
-
-    def time_to_ms(self, time_str):
-        # Format: HH:MM:SS.mmm or MM:SS.mmm
-        parts = time_str.split('.')
-        ms = int(parts[1]) if len(parts) > 1 else 0
-        
-        time_parts = parts[0].split(':')
-        if len(time_parts) == 3:
-            h, m, s = map(int, time_parts)
-            return (h * 3600 + m * 60 + s) * 1000 + ms
-        elif len(time_parts) == 2:
-            m, s = map(int, time_parts)
-            return (m * 60 + s) * 1000 + ms
-        else:
-            return 0 
+    def reset_timeline(self):
+        self.timeline = CueTimeline(self.subtitles)
+        self.current_cue = -1
+        self.subtitle_label.hide()
 
     def on_position_changed(self, position):
-        # Find subtitle for current position
-        current_text = ""
-        for start, end, text in self.subtitles:
-            if start <= position <= end:
-                current_text = text
-                break
+        # Find subtitle for current position; the label is only touched when the cue changes
+        index = self.timeline.index_at(position)
+        if index == self.current_cue:
+            return
+        self.current_cue = index
         
-        if current_text:
-            self.subtitle_label.setText(current_text)
+        if index >= 0:
+            self.subtitle_label.setText(self.timeline.text(index))
             self.subtitle_label.adjustSize()
-            # Center at bottom
-            rect = self.video_widget.rect()
-            self.subtitle_label.move((rect.width() - self.subtitle_label.width()) // 2, rect.height() - self.subtitle_label.height() - 50)
+            self.place_subtitle()
             self.subtitle_label.show()
         else:
             self.subtitle_label.hide()
 
-    def resizeEvent(self, event):
-        # Reposition subtitle on resize
+    def place_subtitle(self):
+        # Center at bottom
         rect = self.video_widget.rect()
         self.subtitle_label.move((rect.width() - self.subtitle_label.width()) // 2, rect.height() - self.subtitle_label.height() - 50)
+
+    def resizeEvent(self, event):
+        # Reposition subtitle on resize
+        self.place_subtitle()
         super().resizeEvent(event)
@@ -0,0 +1,175 @@
+import os
+
+
+class Segment:
+    """One subtitle cue or transcript segment; times are in seconds.
+
+    __slots__ keeps a segment at a fraction of the size of the dict it
+    replaces, which matters for long transcripts held once per language.
+    """
+
+    __slots__ = ('start', 'end', 'text')
+
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def __repr__(self):
+        return f"Segment({self.start!r}, {self.end!r}, {self.text!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Segment):
+            return NotImplemented
+        return (self.start, self.end, self.text) == (other.start, other.end, other.text)
+
+    def replace(self, **changes):
+        """Copy with some fields changed, e.g. segment.replace(text=translated)"""
+        return Segment(changes.get('start', self.start), changes.get('end', self.end), changes.get('text', self.text))
+
+
+def to_records(segments):
+    """Compact JSON form for checkpoints: [[start, end, text], ...]"""
+    return [[segment.start, segment.end, segment.text] for segment in segments]
+
+
+def from_records(records):
+    """Inverse of to_records; also accepts the older [{'start', 'end', 'text'}] form"""
+    segments = []
+    for record in records or []:
+        if isinstance(record, dict):
+            segments.append(Segment(record['start'], record['end'], record['text']))
+        else:
+            segments.append(Segment(*record))
+    return segments
+
+
+SENTENCE_END = ('.', '!', '?', '…', '。', '！', '？', '♪')
+
+
+def merge_sentences(segments, max_seconds=8.0, max_chars=120, max_gap=0.5):
+    """Join adjacent transcript fragments into sentence-sized segments.
+
+    A fragment is appended to the current segment while that segment does
+    not end a sentence, the pause between them is at most max_gap seconds
+    and the result stays within max_seconds and max_chars. Returns
+    (merged, groups): groups[i] is the (first, last) index range of the
+    fragments that make up merged[i], so their original timing stays
+    available. The input segments are not modified.
+    """
+    merged = []
+    groups = []
+    for index, segment in enumerate(segments):
+        if merged:
+            unit = merged[-1]
+            if (not unit.text.rstrip(' "\'”»)').endswith(SENTENCE_END)
+                    and segment.start - unit.end <= max_gap
+                    and segment.end - unit.start <= max_seconds
+                    and len(unit.text) + 1 + len(segment.text) <= max_chars):
+                unit.end = max(unit.end, segment.end)
+                unit.text = f"{unit.text} {segment.text}" if unit.text else segment.text
+                groups[-1] = (groups[-1][0], index)
+                continue
+        merged.append(segment.replace())
+        groups.append((index, index))
+    return merged, groups
+
+
+def format_timestamp(seconds, separator=','):
+    """Seconds -> 'HH:MM:SS,mmm' (SRT) or 'HH:MM:SS.mmm' with separator='.' (VTT)"""
+    ms = round(seconds * 1000) if seconds > 0 else 0
+    secs, ms = divmod(ms, 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
+    return "%02d:%02d:%02d%s%03d" % (hours, minutes, secs, separator, ms)
+
+
+def parse_timestamp(value):
+    """'HH:MM:SS,mmm', 'HH:MM:SS.mmm' or 'MM:SS.mmm' -> seconds. Raises ValueError."""
+    whole, _, fraction = value.strip().replace(',', '.').partition('.')
+    seconds = 0
+    for part in whole.split(':'):
+        seconds = seconds * 60 + int(part)
+    if fraction:
+        # One division, so '4.706' parses to the same float as the literal 4.706
+        scale = 10 ** len(fraction)
+        return (seconds * scale + int(fraction)) / scale
+    return seconds
+
+
+def parse(lines):
+    """Single pass over SRT or WebVTT lines, yielding a Segment per cue.
+
+    A cue starts at a line containing '-->' and runs to the next blank line;
+    anything else outside a cue (indices, cue identifiers, the WEBVTT header,
+    NOTE/STYLE blocks) is skipped. VTT cue settings after the end time are
+    ignored. Multi-line cue text is joined with newlines.
+    """
+    start = end = None
+    text = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            if start is not None:
+                yield Segment(start, end, "\n".join(text))
+                start, text = None, []
+            continue
+        if start is not None:
+            text.append(line)
+        elif '-->' in line:
+            left, _, right = line.partition('-->')
+            try:
+                start = parse_timestamp(left)
+                end = parse_timestamp(right.split()[0])
+            except (ValueError, IndexError):
+                start = None  # Malformed timing line, skip the block
+    if start is not None:
+        yield Segment(start, end, "\n".join(text))
+
+
+def iter_read(path):
+    """Stream the cues of an .srt or .vtt file without reading it whole"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        yield from parse(f)
+
+
+def read(path):
+    return list(iter_read(path))
+
+
+def _write_chunked(f, cues, chunk=1024):
+    """Write an iterable of strings in joined chunks (fewer write calls, bounded memory)"""
+    buffer = []
+    for cue in cues:
+        buffer.append(cue)
+        if len(buffer) >= chunk:
+            f.write("".join(buffer))
+            buffer.clear()
+    f.write("".join(buffer))
+
+
+def write_srt(path, segments):
+    """Write segments as SRT; segments may be any iterable, e.g. a generator"""
+    with open(path, 'w', encoding='utf-8') as f:
+        _write_chunked(f, (
+            "%d\n%s --> %s\n%s\n\n" % (index, format_timestamp(segment.start), format_timestamp(segment.end), segment.text)
+            for index, segment in enumerate(segments, 1)
+        ))
+    return path
+
+
+def write_vtt(path, segments):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("WEBVTT\n\n")
+        _write_chunked(f, (
+            "%s --> %s\n%s\n\n" % (format_timestamp(segment.start, '.'), format_timestamp(segment.end, '.'), segment.text)
+            for segment in segments
+        ))
+    return path
+
+
+def write(path, segments):
+    """Write .vtt or .srt depending on the extension"""
+    if os.path.splitext(path)[1].lower() == '.vtt':
+        return write_vtt(path, segments)
+    return write_srt(path, segments)
@@ -0,0 +1,98 @@
+import json
+import os
+
+import checkpoint
+from checkpoint import JobManifest
+
+
+def reload(manifest):
+    return JobManifest(manifest.directory)
+
+
+def test_stages_survive_a_restart(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    manifest.done('download', file='video.webm')
+    (tmp_path / 'video.webm').write_bytes(b'x')
+    assert reload(manifest).get('download') == {'file': 'video.webm'}
+
+
+def test_stage_is_dropped_when_its_file_is_gone(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    manifest.done('convert', file='missing.mp4')
+    assert manifest.get('convert') is None
+
+
+def test_save_json_and_load_json(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    manifest.save_json('transcript', 'transcript.json', {'language': 'en', 'segments': [[0, 1, "hi"]]})
+    assert reload(manifest).load_json('transcript') == {'language': 'en', 'segments': [[0, 1, "hi"]]}
+    os.remove(tmp_path / 'transcript.json')
+    assert reload(manifest).load_json('transcript') is None
+
+
+def test_reset_and_reset_prefixed(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    for stage in ('download', 'transcript', 'translate:tr', 'tts:tr', 'tts:stream_tr', 'mix:tr', 'output:tr'):
+        manifest.done(stage)
+    manifest.reset('download')
+    manifest.reset_prefixed('translate:', 'tts:', 'mix:', 'output:')
+    assert sorted(reload(manifest).stages) == ['transcript']
+
+
+def test_clip_is_reused_only_for_the_same_text_and_voice(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    manifest.clip_done('tr', 0, 'voice-a', "Merhaba")
+    manifest.clip_done('tr', 1, 'voice-a', "Dünya")
+    manifest.flush()
+
+    clips = reload(manifest).clips('tr', 'voice-a')
+    assert clips == {0: checkpoint.text_hash("Merhaba"), 1: checkpoint.text_hash("Dünya")}
+    # Upstream text changed (new transcript, merge settings or translation): not reusable
+    assert clips.get(0) != checkpoint.text_hash("Selam")
+    assert reload(manifest).clips('tr', 'voice-b') == {}
+
+
+def test_new_voice_drops_earlier_clips(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    manifest.clip_done('tr', 0, 'voice-a', "Merhaba")
+    manifest.clip_done('tr', 1, 'voice-b', "Dünya")
+    assert manifest.clips('tr', 'voice-b') == {1: checkpoint.text_hash("Dünya")}
+
+
+def test_old_clip_list_format_is_ignored(tmp_path):
+    (tmp_path / checkpoint.MANIFEST_NAME).write_text(
+        json.dumps({'stages': {'tts:tr': {'voice': 'voice-a', 'done': [0, 1]}}}), encoding='utf-8')
+    manifest = JobManifest(str(tmp_path))
+    assert manifest.clips('tr', 'voice-a') == {}
+    manifest.clip_done('tr', 0, 'voice-a', "Merhaba")
+    assert manifest.clips('tr', 'voice-a') == {0: checkpoint.text_hash("Merhaba")}
+
+
+def test_clip_writes_are_batched_until_flush(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    count = checkpoint.CLIP_SAVE_INTERVAL + 3
+    for index in range(count):
+        manifest.clip_done('tr', index, 'voice-a', f"text {index}")
+    assert len(reload(manifest).clips('tr', 'voice-a')) == checkpoint.CLIP_SAVE_INTERVAL
+    manifest.flush()
+    assert len(reload(manifest).clips('tr', 'voice-a')) == count
+
+
+def test_job_key_tracks_local_file_changes(tmp_path):
+    video = tmp_path / 'video.mp4'
+    video.write_bytes(b'first')
+    key = checkpoint.job_key(str(video), '720p')
+    assert checkpoint.job_key(str(video), '720p') == key
+    assert checkpoint.job_key(str(video), '1080p') != key
+    video.write_bytes(b'second version')
+    assert checkpoint.job_key(str(video), '720p') != key
+
+
+def test_claim_is_exclusive_until_release():
+    assert checkpoint.claim('test-key')
+    try:
+        assert not checkpoint.claim('test-key')
+    finally:
+        checkpoint.release('test-key')
+    assert checkpoint.claim('test-key')
+    checkpoint.release('test-key')
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+pytest.importorskip('PyQt5.QtMultimedia')
+from player import CueTimeline
+from subtitles import Segment
+
+
+def brute_force(cues, position):
+    """Active cue that started last, by scanning every cue"""
+    best = -1
+    ordered = sorted(cues, key=lambda cue: cue.start)
+    for index, cue in enumerate(ordered):
+        if round(cue.start * 1000) <= position <= round(cue.end * 1000):
+            best = index
+    return best
+
+
+def test_sequential_playback_and_gaps():
+    timeline = CueTimeline([Segment(1.0, 2.0, "a"), Segment(3.0, 4.0, "b")])
+    assert [timeline.index_at(ms) for ms in (0, 1000, 1500, 2500, 3000, 4000, 4001)] == [-1, 0, 0, -1, 1, 1, -1]
+    assert timeline.text(1) == "b"
+
+
+def test_seeking_backwards_and_forwards():
+    timeline = CueTimeline([Segment(i, i + 0.5, str(i)) for i in range(100)])
+    assert timeline.index_at(90200) == 90
+    assert timeline.index_at(10200) == 10
+    assert timeline.index_at(10700) == -1
+
+
+def test_overlapping_cues_prefer_the_latest_start():
+    timeline = CueTimeline([Segment(0.0, 10.0, "long"), Segment(2.0, 3.0, "short")])
+    assert timeline.index_at(2500) == 1
+    assert timeline.index_at(5000) == 0  # The long cue is still running
+
+
+def test_matches_a_linear_scan():
+    rng = random.Random(1)
+    for _ in range(50):
+        cues = []
+        for _ in range(rng.randint(0, 30)):
+            start = rng.uniform(0, 60)
+            cues.append(Segment(start, start + rng.uniform(0.1, 8), "x"))
+        timeline = CueTimeline(cues)
+        positions = sorted(rng.randint(0, 70000) for _ in range(40)) + [rng.randint(0, 70000) for _ in range(40)]
+        for position in positions:
+            assert timeline.index_at(position) == brute_force(cues, position)
@@ -0,0 +1,40 @@
+import media_probe
+
+
+def entry(*streams):
+    return {'streams': list(streams), 'format': {}, 'duration': 10.0}
+
+
+H264 = {'codec_type': 'video', 'codec_name': 'h264', 'pix_fmt': 'yuv420p'}
+AAC = {'codec_type': 'audio', 'codec_name': 'aac'}
+
+
+def test_compatible_streams_are_copied():
+    video, audio, reason = media_probe.plan_transcode(entry(H264, AAC))
+    assert (video, audio) == ('copy', 'copy')
+    assert reason == "video h264 uyumlu, ses aac uyumlu"
+
+
+def test_incompatible_codecs_are_encoded():
+    vp9 = {'codec_type': 'video', 'codec_name': 'vp9', 'pix_fmt': 'yuv420p'}
+    opus = {'codec_type': 'audio', 'codec_name': 'opus'}
+    assert media_probe.plan_transcode(entry(vp9, opus))[:2] == ('encode', 'encode')
+
+
+def test_10_bit_h264_is_encoded():
+    high10 = dict(H264, pix_fmt='yuv420p10le')
+    assert media_probe.plan_transcode(entry(high10, AAC))[:2] == ('encode', 'copy')
+
+
+def test_missing_streams_and_missing_probe():
+    assert media_probe.plan_transcode(entry(AAC))[:2] == (None, 'copy')
+    assert media_probe.plan_transcode(None)[:2] == ('encode', 'encode')
+
+
+def test_cover_art_is_not_the_video_stream():
+    cover = {'codec_type': 'video', 'codec_name': 'mjpeg', 'disposition': {'attached_pic': 1}}
+    assert media_probe.plan_transcode(entry(cover, AAC))[:2] == (None, 'copy')
+
+
+def test_compatible_codecs_are_configurable():
+    assert media_probe.plan_transcode(entry(H264, AAC), compatible_video=['hevc'])[:2] == ('encode', 'copy')
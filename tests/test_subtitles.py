@@ -0,0 +1,86 @@
+import pytest
+
+import subtitles
+from subtitles import Segment
+
+
+def test_timestamps_round_trip():
+    assert subtitles.format_timestamp(3723.456) == "01:02:03,456"
+    assert subtitles.format_timestamp(3723.456, '.') == "01:02:03.456"
+    assert subtitles.format_timestamp(-1) == "00:00:00,000"
+    assert subtitles.parse_timestamp("01:02:03,456") == 3723.456
+    assert subtitles.parse_timestamp("02:03.5") == 123.5
+    # Same float as the literal, so written cues compare equal after reading
+    assert subtitles.parse_timestamp("00:00:04,706") == 4.706
+
+
+def test_parse_timestamp_rejects_garbage():
+    with pytest.raises(ValueError):
+        subtitles.parse_timestamp("aa:bb:cc,ddd")
+
+
+def test_parse_srt_with_multiline_cues_and_bad_blocks():
+    lines = [
+        "1", "00:00:01,000 --> 00:00:02,500", "Hello", "world", "",
+        "2", "00:00:0x,000 --> 00:00:04,000", "Broken timing", "",
+        "3", "00:00:05,000 --> 00:00:06,000", "Last",
+    ]
+    assert list(subtitles.parse(lines)) == [
+        Segment(1.0, 2.5, "Hello\nworld"),
+        Segment(5.0, 6.0, "Last"),
+    ]
+
+
+def test_parse_vtt_skips_header_notes_and_settings():
+    lines = [
+        "WEBVTT", "",
+        "NOTE made by hand", "",
+        "intro", "00:01.000 --> 00:02.000 align:start position:10%", "Hi", "",
+    ]
+    assert list(subtitles.parse(lines)) == [Segment(1.0, 2.0, "Hi")]
+
+
+@pytest.mark.parametrize('name', ['cues.srt', 'cues.vtt'])
+def test_write_and_read_back(tmp_path, name):
+    segments = [Segment(0.0, 1.25, "One"), Segment(2.0, 3.5, "Two\nlines"), Segment(3600.001, 3601.0, "Late")]
+    path = str(tmp_path / name)
+    subtitles.write(path, iter(segments))
+    assert subtitles.read(path) == segments
+
+
+def test_records_round_trip_and_old_dict_form():
+    segments = [Segment(0.5, 1.0, "a"), Segment(1.5, 2.0, "b")]
+    assert subtitles.from_records(subtitles.to_records(segments)) == segments
+    assert subtitles.from_records([{'start': 0.5, 'end': 1.0, 'text': "a"}]) == segments[:1]
+    assert subtitles.from_records(None) == []
+
+
+def test_merge_sentences_joins_until_sentence_end():
+    fragments = [
+        Segment(0.0, 1.0, "This is"),
+        Segment(1.1, 2.0, "one sentence."),
+        Segment(2.2, 3.0, "Another"),
+        Segment(3.1, 4.0, "one!"),
+    ]
+    merged, groups = subtitles.merge_sentences(fragments)
+    assert merged == [Segment(0.0, 2.0, "This is one sentence."), Segment(2.2, 4.0, "Another one!")]
+    assert groups == [(0, 1), (2, 3)]
+    assert fragments[0] == Segment(0.0, 1.0, "This is")  # Input left untouched
+
+
+def test_merge_sentences_respects_gap_duration_and_length():
+    pause = [Segment(0.0, 1.0, "before"), Segment(2.0, 3.0, "after")]
+    assert len(subtitles.merge_sentences(pause, max_gap=0.5)[0]) == 2
+
+    long_run = [Segment(i, i + 1.0, "word") for i in range(10)]
+    merged, groups = subtitles.merge_sentences(long_run, max_seconds=4.0)
+    assert all(segment.end - segment.start <= 4.0 for segment in merged)
+    assert groups[0] == (0, 3)
+
+    merged, _ = subtitles.merge_sentences(long_run, max_chars=10)
+    assert all(len(segment.text) <= 10 for segment in merged)
+
+
+def test_merge_sentences_sees_through_closing_quotes():
+    fragments = [Segment(0.0, 1.0, 'He said "stop."'), Segment(1.1, 2.0, "Then left")]
+    assert len(subtitles.merge_sentences(fragments)[0]) == 2
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('pydub')
+from audio_mixer import time_stretch
+
+RATE = 24000
+
+
+def tone(seconds, frequency=220.0, channels=None):
+    t = np.arange(int(seconds * RATE)) / RATE
+    samples = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    return samples if channels is None else np.repeat(samples[:, None], channels, axis=1)
+
+
+def dominant_frequency(samples):
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return np.fft.rfftfreq(len(samples), 1 / RATE)[np.argmax(spectrum)]
+
+
+@pytest.mark.parametrize('rate', [1.25, 1.5, 2.0, 2.7, 0.8])
+def test_length_follows_rate_and_pitch_is_kept(rate):
+    stretched = time_stretch(tone(2.0), rate, RATE)
+    assert len(stretched) == round(2.0 * RATE / rate)
+    assert stretched.dtype == np.float32
+    assert abs(dominant_frequency(stretched) - 220.0) < 5
+
+
+def test_channels_are_kept():
+    stretched = time_stretch(tone(1.0, channels=2), 1.5, RATE)
+    assert stretched.shape == (round(RATE / 1.5), 2)
+
+
+def test_unit_rate_and_empty_input_are_unchanged():
+    samples = tone(0.5)
+    assert time_stretch(samples, 1.0, RATE) is samples
+    assert len(time_stretch(np.zeros(0, dtype=np.float32), 1.5, RATE)) == 0
+
+
+def test_short_clip_is_resampled():
+    stretched = time_stretch(tone(0.01), 2.0, RATE)
+    assert len(stretched) == round(0.01 * RATE / 2.0)
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        time_stretch(tone(0.1), 0, RATE)
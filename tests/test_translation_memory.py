@@ -0,0 +1,145 @@
+import threading
+import time
+
+import pytest
+
+from cancellation import CancelToken, Cancelled
+
+import translation_memory
+from translation_memory import TranslationMemory, make_batches, translate_texts
+
+
+class StubTranslator:
+    """Local translator: upper-cases each line and records every request"""
+
+    def __init__(self, calls, fail=(), drop_lines=False):
+        self.calls = calls
+        self.fail = set(fail)
+        self.drop_lines = drop_lines
+
+    def translate(self, text):
+        self.calls.append(text)
+        if text in self.fail:
+            raise RuntimeError("stub failure")
+        lines = text.split("\n")
+        if self.drop_lines and len(lines) > 1:
+            return " ".join(lines).upper()  # Engine lost the line structure
+        return "\n".join(line.upper() for line in lines)
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "memory.sqlite3"))
+    yield memory
+    memory.close()
+
+
+def factory(calls, **kwargs):
+    lock = threading.Lock()
+
+    def make():
+        with lock:
+            return StubTranslator(calls, **kwargs)
+    return make
+
+
+def test_duplicates_are_translated_once():
+    calls = []
+    texts = ["hello", "world", "hello", "  hello  ", "world"]
+    result = translate_texts(texts, factory(calls), 'en', 'tr', workers=1)
+    assert result == ["HELLO", "WORLD", "HELLO", "HELLO", "WORLD"]
+    assert calls == ["hello\nworld"]
+
+
+def test_make_batches_respects_limits():
+    texts = ["x" * 10] * 25
+    batches = make_batches(texts, max_chars=50, max_items=100)
+    assert sum(len(batch) for batch in batches) == 25
+    assert all(len("\n".join(batch)) <= 50 for batch in batches)
+
+    batches = make_batches(["a"] * 250, max_chars=10000, max_items=100)
+    assert [len(batch) for batch in batches] == [100, 100, 50]
+
+
+def test_oversized_text_gets_its_own_batch():
+    batches = make_batches(["short", "y" * 100, "tail"], max_chars=20)
+    assert ["y" * 100] in batches
+    assert sum(len(batch) for batch in batches) == 3
+
+
+def test_falls_back_to_one_request_per_line():
+    calls = []
+    result = translate_texts(["one", "two", "three"], factory(calls, drop_lines=True), 'en', 'tr', workers=1)
+    assert result == ["ONE", "TWO", "THREE"]
+    assert calls[0] == "one\ntwo\nthree"
+    assert sorted(calls[1:]) == ["one", "three", "two"]
+
+
+def test_second_run_is_served_from_memory(memory):
+    calls = []
+    texts = ["good morning", "good night"]
+    first = translate_texts(texts, factory(calls), 'en', 'tr', memory=memory, workers=1)
+    assert memory.misses == 2 and memory.hits == 0
+
+    calls.clear()
+    second = translate_texts(texts, factory(calls), 'en', 'tr', memory=memory, workers=1)
+    assert second == first
+    assert calls == []
+    assert memory.hits == 2
+
+
+def test_memory_is_keyed_by_language_pair(memory):
+    calls = []
+    translate_texts(["hello"], factory(calls), 'en', 'tr', memory=memory, workers=1)
+    translate_texts(["hello"], factory(calls), 'en', 'de', memory=memory, workers=1)
+    assert len(calls) == 2
+
+
+def test_failed_texts_fall_back_to_source(memory):
+    calls = []
+    stub = factory(calls, fail={"a\nbad\nc", "bad"})
+    untranslated = []
+    result = translate_texts(["a", "bad", "c"], stub, 'en', 'tr', memory=memory, workers=1, untranslated=untranslated)
+    assert result == ["A", "bad", "C"]
+    assert untranslated == ["bad"]
+    # Failures are not remembered, so the next run retries them
+    assert memory.lookup_many(["bad"], 'en', 'tr', 'google') == {}
+
+
+def test_nothing_untranslated_on_success(memory):
+    untranslated = []
+    translate_texts(["a", "b"], factory([]), 'en', 'tr', memory=memory, workers=1, untranslated=untranslated)
+    translate_texts(["a", "b"], factory([]), 'en', 'tr', memory=memory, workers=1, untranslated=untranslated)
+    assert untranslated == []
+
+
+def test_batches_run_in_parallel_and_keep_order():
+    calls = []
+    texts = [f"text {i}" for i in range(40)]
+    result = translate_texts(texts, factory(calls), 'en', 'tr', max_chars=30, workers=4)
+    assert result == [text.upper() for text in texts]
+    assert len(calls) > 1
+
+
+def test_cancel_does_not_wait_for_a_running_request():
+    release = threading.Event()
+
+    class SlowTranslator:
+        def translate(self, text):
+            release.wait(5)  # An HTTP request that is slow to answer
+            return text.upper()
+
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(Cancelled):
+            translate_texts(["a", "b"], SlowTranslator, 'en', 'tr', workers=1, cancel_token=token)
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+
+
+def test_get_memory_is_shared_per_path(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    assert translation_memory.get_memory(path) is translation_memory.get_memory(path)
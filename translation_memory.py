@@ -0,0 +1,181 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from cancellation import CancelToken
+
+
+class TranslationMemory:
+    """Persistent SQLite store of translations.
+
+    Keyed by (source text, source lang, target lang, engine) so recurring
+    phrases and re-runs are served locally instead of hitting the network.
+    """
+
+    def __init__(self, path="cache/translation_memory.sqlite3"):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source_text TEXT NOT NULL,"
+                " source_lang TEXT NOT NULL,"
+                " target_lang TEXT NOT NULL,"
+                " engine TEXT NOT NULL,"
+                " translated_text TEXT NOT NULL,"
+                " PRIMARY KEY (source_text, source_lang, target_lang, engine))"
+            )
+        self.hits = 0
+        self.misses = 0
+
+    def lookup_many(self, texts, source_lang, target_lang, engine):
+        """Return {source_text: translated_text} for the texts already in memory"""
+        found = {}
+        texts = list(texts)
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(texts), 500):
+                chunk = texts[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT source_text, translated_text FROM translations"
+                    f" WHERE source_lang = ? AND target_lang = ? AND engine = ? AND source_text IN ({placeholders})",
+                    [source_lang, target_lang, engine] + chunk
+                )
+                found.update(rows)
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def store_many(self, translations, source_lang, target_lang, engine):
+        """Persist a {source_text: translated_text} mapping"""
+        if not translations:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                [(text, source_lang, target_lang, engine, translated)
+                 for text, translated in translations.items()]
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def make_batches(texts, max_chars=4500, max_items=100):
+    """Group texts into batches whose newline-joined size stays under max_chars"""
+    batches = []
+    current = []
+    size = 0
+    for text in texts:
+        if current and (size + len(text) + 1 > max_chars or len(current) >= max_items):
+            batches.append(current)
+            current = []
+            size = 0
+        current.append(text)
+        size += len(text) + 1
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_batch(translator, batch):
+    """Translate a batch in one request by joining lines.
+
+    Falls back to one request per text when the engine does not preserve
+    the line structure. Texts that fail to translate are left out.
+    """
+    if len(batch) > 1:
+        try:
+            result = translator.translate("\n".join(batch))
+            lines = result.split("\n") if result else []
+            if len(lines) == len(batch):
+                return {text: line.strip() for text, line in zip(batch, lines) if line.strip()}
+        except Exception as e:
+            print(f"Batch translation error: {e}")
+
+    translated = {}
+    for text in batch:
+        try:
+            result = translator.translate(text)
+            if result:
+                translated[text] = result
+        except Exception as e:
+            print(f"Translation error: {e}")
+    return translated
+
+
+def translate_texts(texts, translator_factory, source_lang, target_lang, engine="google",
+                    memory=None, max_chars=4500, workers=4, on_progress=None, cancel_token=None,
+                    untranslated=None, poll=0.2):
+    """Translate a list of texts with deduplication, batching and a translation memory.
+
+    translator_factory() must return an object with a translate(text) method;
+    one translator is created per batch so workers do not share state.
+    Returns translations aligned with texts; untranslatable texts are returned
+    as-is and, if untranslated is a list, added to it (normalized, once each).
+    Cancelling cancel_token raises Cancelled within poll seconds: batches
+    that have not started are dropped, and a request already in flight is
+    left to finish in the background with its result discarded.
+    """
+    cancel_token = cancel_token or CancelToken()
+    # Newlines are the batch separator, so flatten them first
+    normalized = [" ".join(text.split()) for text in texts]
+    unique = [text for text in dict.fromkeys(normalized) if text]
+
+    translations = memory.lookup_many(unique, source_lang, target_lang, engine) if memory else {}
+    missing = [text for text in unique if text not in translations]
+    batches = make_batches(missing, max_chars)
+
+    if batches:
+        def work(batch):
+            cancel_token.check()
+            return translate_batch(translator_factory(), batch)
+
+        def cancel_pending():
+            for future in futures:
+                future.cancel()
+
+        done = 0
+        executor = ThreadPoolExecutor(max_workers=max(1, min(int(workers), len(batches))))
+        try:
+            futures = [executor.submit(work, batch) for batch in batches]
+            with cancel_token.on_cancel(cancel_pending):
+                for future in futures:
+                    # Poll instead of blocking in result(), so a cancel does not
+                    # wait for an HTTP request that is already running
+                    while not wait([future], timeout=poll).done:
+                        cancel_token.check()
+                    cancel_token.check()
+                    result = future.result()
+                    translations.update(result)
+                    if memory:
+                        memory.store_many(result, source_lang, target_lang, engine)
+                    done += 1
+                    if on_progress:
+                        on_progress(done, len(batches))
+        finally:
+            # On cancel, do not join the thread still waiting for its response
+            executor.shutdown(wait=not cancel_token.cancelled)
+
+    if untranslated is not None:
+        untranslated.extend(text for text in missing if text not in translations)
+    return [translations.get(text, original) for text, original in zip(normalized, texts)]
+
+
+_memories = {}
+_memories_lock = threading.Lock()
+
+
+def get_memory(path):
+    """Return the process-wide TranslationMemory for path"""
+    with _memories_lock:
+        if path not in _memories:
+            _memories[path] = TranslationMemory(path)
+        return _memories[path]
@@ -0,0 +1,51 @@
+import asyncio
+
+
+class RateLimiter:
+    """Spaces request starts so an engine sees at most `rate` requests per second.
+
+    Must be created inside the event loop that uses it.
+    """
+
+    def __init__(self, rate=0):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            if self._next_slot > now:
+                await asyncio.sleep(self._next_slot - now)
+                now = loop.time()
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+
+async def run_bounded(items, worker, concurrency=4, on_done=None):
+    """Run `await worker(index, item)` for every item with at most `concurrency` in flight.
+
+    Results are returned in input order. A failed item yields its exception
+    instead of a result, so one bad segment does not cancel the rest.
+    on_done(completed_count, total) is called as each item finishes.
+    """
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+    total = len(items)
+    completed = 0
+
+    async def guarded(index, item):
+        nonlocal completed
+        async with semaphore:
+            try:
+                return await worker(index, item)
+            finally:
+                completed += 1
+                if on_done:
+                    on_done(completed, total)
+
+    return await asyncio.gather(
+        *(guarded(index, item) for index, item in enumerate(items)),
+        return_exceptions=True
+    )
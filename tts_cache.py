@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+
+class TTSCache:
+    """Content-addressed on-disk cache of synthesized TTS clips.
+
+    Clips are keyed by a hash of (normalized text, voice, engine, model, speed).
+    File modification time is used as the LRU clock: hits touch the file and
+    the oldest clips are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory="cache/tts", max_bytes=1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(text, voice, engine, model_id="", speed=1.0):
+        normalized = " ".join(text.split()).strip()
+        payload = json.dumps([normalized, voice, engine, model_id or "", round(float(speed), 3)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".mp3")
+
+    def fetch(self, key, output_file):
+        """Copy the cached clip to output_file. Returns True on a hit."""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, output_file)
+            os.utime(path, None)  # Mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key, source_file):
+        """Add a freshly synthesized clip to the cache"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copyfile(source_file, temp_path)
+            os.replace(temp_path, path)  # Atomic, concurrent writers are safe
+        except OSError as e:
+            print(f"TTS cache write error: {e}")
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size += os.path.getsize(path)
+            self._evict_if_needed()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".mp3"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield st.st_mtime, st.st_size, path
+
+    def _evict_if_needed(self):
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        if self._size <= self.max_bytes:
+            return
+        # Evict least recently used clips down to 90% of the cap
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(self._entries()):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                pass
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(config):
+    """Return the process-wide TTSCache described by config, or None if disabled"""
+    config = config or {}
+    if not config.get('tts_cache', True):
+        return None
+    directory = config.get('tts_cache_dir', 'cache/tts')
+    with _caches_lock:
+        if directory not in _caches:
+            _caches[directory] = TTSCache(directory)
+        cache = _caches[directory]
+    cache.max_bytes = int(config.get('tts_cache_max_mb', 1024)) * 1024 * 1024
+    return cache
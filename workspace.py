@@ -0,0 +1,41 @@
+import os
+import shutil
+import uuid
+
+
+class JobWorkspace:
+    """Private working directory for one job.
+
+    Every temp and intermediate file of the job lives under
+    media/.jobs/<job_id>/, so concurrent jobs never share a path. Finished
+    outputs are moved into media/ with an atomic rename.
+    """
+
+    def __init__(self, job_id=None, root=os.path.join('media', '.jobs'), output_dir='media'):
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        self.output_dir = output_dir
+        self.path = os.path.abspath(os.path.join(root, self.job_id))
+        os.makedirs(self.path, exist_ok=True)
+        os.makedirs(output_dir, exist_ok=True)
+
+    def file(self, name):
+        """Path of a file inside the workspace"""
+        return os.path.join(self.path, name)
+
+    def publish(self, path, name=None, copy=False):
+        """Atomically move a finished file from the workspace into the output directory.
+
+        With copy=True the workspace keeps its file (used when the job will
+        be resumed and still needs it).
+        """
+        target = os.path.abspath(os.path.join(self.output_dir, name or os.path.basename(path)))
+        if copy:
+            temp_path = target + '.tmp'
+            shutil.copy2(path, temp_path)
+            os.replace(temp_path, target)
+        else:
+            os.replace(path, target)
+        return target
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)